@@ -10,7 +10,7 @@ Description:
 
 Usage:
     python compress_directories.py --source_directories [dir1] [dir2] ... --output_directory [output_dir]
-                             --archive_format format --overwrite --delete_source --verbose
+                             --archive_format format --compression_level level --overwrite --delete_source --jobs N --verbose
 
     Example:
     python compress_directories.py --source_directories /path/to/source1 /path/to/source2
@@ -19,20 +19,36 @@ Usage:
 Command Line Arguments:
     --source_directories, -s: List of source directories to archive.
     --output_directory: Directory to output archives.
-    --archive_format: Format of the archive (e.g., 'zip', 'tar', 'gztar', 'bztar', 'xztar').
-    --overwrite, -o: Flag indicating whether to overwrite an existing archive.
+    --archive_format: Format of the archive (e.g., 'zip', 'tar', 'gztar', 'bztar', 'xztar', 'zstd', 'brotli'). Default is 'zstd'.
+    --compression_level: Compression level for compressed tar formats. Defaults to 6 for gztar/xztar, 1 for bztar, 3 for zstd, 4 for brotli.
+    --overwrite, -o: Flag indicating whether to overwrite an existing archive. Without it, existing archives are
+        only rebuilt if their source directory changed since they were created.
     --delete_source, -d: Flag indicating whether to delete source directories after archiving.
+    --jobs, -j: Maximum number of directories to archive at once. Default is the number of cpus, up to 32.
     --verbose, -v: Verbosity flag to control the level of logging. Default is set to WARNING.
 
 Enums:
-    ArchiveFormat: Enum representing different archive formats (ZIP, TAR, GZTAR, BZTAR, XZTAR).
+    ArchiveFormat: Enum representing different archive formats (ZIP, TAR, GZTAR, BZTAR, XZTAR, ZSTD, BROTLI).
 
 Functions:
     - parse_arguments(): Parses command line arguments using argparse and returns the parsed arguments.
-    - archive_directory(source_directory, archive_path, root_dir, base_dir, archive_format, logger, delete):
+    - compress_with_external_tool(archive_path, root_dir, base_dir, archive_format, compression_level):
+        Creates plain tar archives with tar, and pipes tar into a multithreaded compressor
+        (pigz, pbzip2, xz -T0, zstd -T0) when one is on the PATH.
+    - archive_directories_async(tasks, archive_format, logger, delete, compression_level, max_workers):
+        Runs the external tar/compressor pipelines for many directories at once from an asyncio event loop.
+    - ARCHIVERS: Maps each ArchiveFormat to the function that creates its archives, built once at import.
+        Tar formats use the external tools when available, then libarchive-c when installed, then tarfile.
+    - archive_directory(source_directory, archive_path, root_dir, base_dir, archive_format, logger, delete, compression_level):
         Archives a source directory into the specified archive file.
-    - main(source_directories, output_directory, archive_format, overwrite, delete_source, log_level):
-        Main function to orchestrate the archiving process.
+    - load_archive_manifest(output_directory, logger), save_archive_manifest(output_directory, manifest):
+        Read and write the manifest of source fingerprints kept in the output directory.
+    - check_archive_names(source_directories): Raises if two source directories would be archived to the same file.
+    - get_archive_tasks(source_directories, output_directory, archive_format, overwrite, logger, manifest, fingerprints):
+        Builds the list of archiving tasks, skipping archives that exist and are up to date.
+    - main(source_directories, output_directory, archive_format, overwrite, delete_source, log_level, compression_level, jobs):
+        Main function to orchestrate the archiving process, archiving directories in parallel
+        with asyncio subprocesses when the external tools are available, or a process pool otherwise.
 
 Utilities:
     - Various utility functions such as get_folder_size, get_file_size, get_time_hh_mm_ss, and setup_logger are imported from the 'utils' module.
@@ -47,18 +63,42 @@ Example:
 
 
 
+import os
+import contextlib
+import json
+import asyncio
 import pathlib
 import shutil
+import subprocess
 import logging
 import argparse
 import time
 from datetime import timedelta, datetime
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Tuple, Callable, Dict, Iterator
 from enum import Enum
-from utils import get_folder_size, get_file_size, get_time_hh_mm_ss, setup_logger, get_base_directory, ArchiveFormat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from utils import ByteSize, get_folder_size, get_folder_fingerprint_and_size, get_file_size, get_time_hh_mm_ss, setup_logger, get_base_directory, ArchiveFormat, \
+    DEFAULT_COMPRESSION_LEVELS, SHUTIL_FORMAT_NAMES, make_tar_archive, \
+    make_libarchive_archive, LIBARCHIVE_FORMATS, get_log_queue, setup_worker_logger, stop_logger
 
 
+# multithreaded external compressors used in place of python's single threaded gzip/bz2/lzma modules
+PARALLEL_COMPRESSORS = {
+    ArchiveFormat.GZTAR: ['pigz', '-c'],
+    ArchiveFormat.BZTAR: ['pbzip2', '-c'],
+    ArchiveFormat.XZTAR: ['xz', '-T0', '-c'],
+    ArchiveFormat.ZSTD: ['zstd', '-T0', '-c'],
+}
+
+
+# default number of directories to archive at once
+DEFAULT_JOBS = min(32, os.cpu_count() or 1)
+
+
+# file in the output directory recording the source fingerprint each archive was created from
+ARCHIVE_MANIFEST_NAME = '.archive_manifest.json'
+
 
 def parse_arguments() -> argparse.Namespace:
     """
@@ -71,9 +111,11 @@ def parse_arguments() -> argparse.Namespace:
     p = argparse.ArgumentParser()
     p.add_argument('--source_directories', '-s', nargs='+', help='source directories to archive', required=True)
     p.add_argument('--output_directory', required=True, help="directory to output archives")
-    p.add_argument('--archive_format', default='xztar', help="format of the archive (e.g., 'zip', 'tar', 'gztar', 'bztar', 'xztar')")
+    p.add_argument('--archive_format', default='zstd', help="format of the archive (e.g., 'zip', 'tar', 'gztar', 'bztar', 'xztar', 'zstd', 'brotli')")
+    p.add_argument('--compression_level', type=int, default=None, help="compression level for compressed tar formats (defaults to 6 for gztar/xztar, 1 for bztar, 3 for zstd, 4 for brotli)")
     p.add_argument('--overwrite', '-o', action='store_true', help='whether to overwrite an existing archive')
     p.add_argument('--delete_source', '-d', action='store_true', help='whether to delete source directories after archiving')
+    p.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS, help=f'maximum number of directories to archive at once (default {DEFAULT_JOBS})')
     p.add_argument(
                    '-v', '--verbose',
                    help='Be verbose',
@@ -85,17 +127,413 @@ def parse_arguments() -> argparse.Namespace:
 
     args = p.parse_args()
 
+    if args.jobs < 1:
+        raise ValueError(f"Invalid number of jobs: {args.jobs}, expected at least 1")
+
     archive_format_arg_str = args.archive_format.upper()
 
     try:
         args.archive_format = ArchiveFormat[archive_format_arg_str]
 
     except KeyError:
-        raise ValueError(f"Invalid archive format: {args.archive_format}")
+        raise ValueError(
+            f"Invalid archive format: {args.archive_format}, "
+            f"expected one of: {', '.join(SHUTIL_FORMAT_NAMES.values())}"
+        )
 
     return args
 
 
+def external_tools_available(archive_format: ArchiveFormat) -> bool:
+    """
+    Checks whether tar, and the multithreaded compressor for the format, are on the PATH.
+
+    Args:
+        archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.TAR, ArchiveFormat.GZTAR).
+
+    Returns:
+        bool: True if the archive can be created with external tools, False otherwise.
+    """
+
+    # without tar on the PATH, let the caller fall back
+    if shutil.which('tar') is None:
+        return False
+
+    # plain tar archives need no compressor
+    if archive_format == ArchiveFormat.TAR:
+        return True
+
+    compressor_command = PARALLEL_COMPRESSORS.get(archive_format)
+
+    # if there is no compressor for this format, or it is not on the PATH, let the caller fall back
+    return compressor_command is not None and shutil.which(compressor_command[0]) is not None
+
+
+def get_external_tool_commands(
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        compression_level: Union[int, None] = None,
+) -> List[List[str]]:
+    """
+    Builds the pipeline of external commands that write the archive to stdout.
+
+    Args:
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.TAR, ArchiveFormat.GZTAR).
+        compression_level (Union[int, None], optional): The compression level. Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+
+    Returns:
+        List[List[str]]: The commands to run, each one reading the previous command's stdout.
+    """
+
+    # tar writes the uncompressed stream to stdout, using its own large buffers
+    commands = [['tar', '-c', '-C', str(root_dir), str(base_dir)]]
+
+    # plain tar archives need no compressor
+    if archive_format == ArchiveFormat.TAR:
+        return commands
+
+    if compression_level is None:
+        compression_level = DEFAULT_COMPRESSION_LEVELS[archive_format]
+
+    # every supported compressor takes the level as a -N flag
+    commands.append(PARALLEL_COMPRESSORS[archive_format] + [f'-{compression_level}'])
+
+    return commands
+
+
+def _check_pipeline_returncodes(commands: List[List[str]], returncodes: List[int]) -> None:
+    """
+    Raises if any command in an external pipeline failed.
+
+    Args:
+        commands (List[List[str]]): The commands that were run.
+        returncodes (List[int]): The exit code of each command.
+
+    Raises:
+        RuntimeError: If any command exited with a non-zero status.
+    """
+
+    if any(returncodes):
+        exit_codes = ', '.join(f'{command[0]} exit code: {returncode}' for command, returncode in zip(commands, returncodes))
+        raise RuntimeError(f'External archive pipeline failed ({exit_codes})')
+
+
+def compress_with_external_tool(
+        archive_path: Union[str, pathlib.Path],
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        compression_level: Union[int, None] = None,
+) -> None:
+    """
+    Creates a tar archive with an external tar process, piped into a multithreaded compressor for compressed formats.
+
+    The caller is responsible for checking external_tools_available(archive_format) first.
+
+    Args:
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created, minus the extension.
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.TAR, ArchiveFormat.GZTAR).
+        compression_level (Union[int, None], optional): The compression level. Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: If any process in the pipeline exits with a non-zero status.
+    """
+
+    commands = get_external_tool_commands(root_dir, base_dir, archive_format, compression_level)
+
+    archive_output_filepath = Path(f'{archive_path}.{archive_format.value}')
+
+    with open(archive_output_filepath, 'wb') as archive_file:
+
+        processes = []
+        stdin = None
+
+        for index, command in enumerate(commands):
+
+            # the last command writes the archive, every other one pipes into the next
+            last = index == len(commands) - 1
+            process = subprocess.Popen(command, stdin=stdin, stdout=archive_file if last else subprocess.PIPE)
+
+            # close our copy of the pipe so the writer receives SIGPIPE if the reader exits early
+            if stdin is not None:
+                stdin.close()
+
+            stdin = process.stdout
+            processes.append(process)
+
+        returncodes = [process.wait() for process in processes]
+
+    _check_pipeline_returncodes(commands, returncodes)
+
+
+async def compress_with_external_tool_async(
+        archive_path: Union[str, pathlib.Path],
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        compression_level: Union[int, None] = None,
+) -> None:
+    """
+    Asyncio version of compress_with_external_tool, for when the external tools are known to be available.
+
+    Args:
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created, minus the extension.
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.TAR, ArchiveFormat.GZTAR).
+        compression_level (Union[int, None], optional): The compression level. Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: If any process in the pipeline exits with a non-zero status.
+    """
+
+    commands = get_external_tool_commands(root_dir, base_dir, archive_format, compression_level)
+
+    archive_output_filepath = Path(f'{archive_path}.{archive_format.value}')
+
+    with open(archive_output_filepath, 'wb') as archive_file:
+
+        processes = []
+        read_fd = None
+
+        for index, command in enumerate(commands):
+
+            # the last command writes the archive, every other one writes into an os pipe read by the next
+            last = index == len(commands) - 1
+            next_read_fd, write_fd = (None, archive_file.fileno()) if last else os.pipe()
+
+            process = await asyncio.create_subprocess_exec(*command, stdin=read_fd, stdout=write_fd)
+
+            # the children hold their own copies of the pipe ends, so close ours
+            if read_fd is not None:
+                os.close(read_fd)
+            if not last:
+                os.close(write_fd)
+
+            read_fd = next_read_fd
+            processes.append(process)
+
+        returncodes = [await process.wait() for process in processes]
+
+    _check_pipeline_returncodes(commands, returncodes)
+
+
+def _archive_zip(
+        archive_path: Union[str, pathlib.Path],
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        compression_level: Union[int, None],
+        logger: logging.Logger,
+) -> None:
+    """
+    Creates a zip archive with shutil.make_archive.
+
+    Args:
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created, minus the extension.
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        compression_level (Union[int, None]): Unused, accepted so every archiver has the same signature.
+        logger (logging.Logger): The logger object to handle log messages.
+
+    Returns:
+        None
+    """
+
+    shutil.make_archive(archive_path, SHUTIL_FORMAT_NAMES[ArchiveFormat.ZIP], root_dir, base_dir, logger=logger)
+
+
+def _make_tar_archiver(archive_format: ArchiveFormat) -> Callable[..., None]:
+    """
+    Builds the archiver for a tar format, choosing between the external tools, libarchive, and tarfile once, up front.
+
+    Args:
+        archive_format (ArchiveFormat): The tar format to build the archiver for.
+
+    Returns:
+        Callable[..., None]: A function taking (archive_path, root_dir, base_dir, compression_level, logger).
+    """
+
+    if archive_format in EXTERNAL_TOOL_FORMATS:
+
+        # tar, and the multithreaded compressor for compressed formats, are on the PATH
+        def archive(archive_path, root_dir, base_dir, compression_level, logger):
+            compress_with_external_tool(archive_path, root_dir, base_dir, archive_format, compression_level)
+            logger.info('Archive created with external tar process')
+
+    elif archive_format in LIBARCHIVE_FORMATS:
+
+        # libarchive-c is installed, build the tar in C instead of tarfile
+        def archive(archive_path, root_dir, base_dir, compression_level, logger):
+            make_libarchive_archive(archive_path, base_dir, archive_format, compression_level, root_dir=root_dir)
+            logger.info('Archive created with libarchive')
+
+    else:
+
+        # stream the tar with tarfile, through python's compressors at the requested level
+        def archive(archive_path, root_dir, base_dir, compression_level, logger):
+            make_tar_archive(archive_path, base_dir, archive_format, compression_level, root_dir=root_dir)
+
+    return archive
+
+
+# formats whose archives can be created with external tools, looked up once at import rather than per archive
+EXTERNAL_TOOL_FORMATS = frozenset(
+    archive_format for archive_format in ArchiveFormat if external_tools_available(archive_format)
+)
+
+# the function that creates the archive for each format, specialised at import time
+ARCHIVERS = {
+    archive_format: _archive_zip if archive_format == ArchiveFormat.ZIP else _make_tar_archiver(archive_format)
+    for archive_format in ArchiveFormat
+}
+
+
+def _log_directory_size(
+        source_directory: Union[str, pathlib.Path],
+        logger: logging.Logger,
+        directory_size: Union[ByteSize, None] = None,
+) -> ByteSize:
+    """
+    Logs the start of archiving and the size of the source directory.
+
+    Args:
+        source_directory (Union[str, pathlib.Path]): The path to the source directory to be archived.
+        logger (logging.Logger): The logger object to handle log messages.
+        directory_size (Union[ByteSize, None], optional): The size of the source directory, if main already measured it
+            while fingerprinting. Defaults to None, walking the directory for it.
+
+    Returns:
+        ByteSize: The size of the source directory.
+    """
+
+    # Log the start of the archiving process
+    logger.info('Starting archive creation from source directory: %s', source_directory)
+
+    # get the size of the source directory, unless it was measured along with its fingerprint
+    if directory_size is None:
+        directory_size = get_folder_size(source_directory)
+
+    # if there was no error during calculating source directory size, print it out
+    if directory_size:
+        # print the size of the original directory
+        logger.info('Original Directory Size: %s', directory_size)
+
+    return directory_size
+
+
+def _finish_archive(
+        source_directory: Union[str, pathlib.Path],
+        archive_path: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        directory_size: ByteSize,
+        delete: bool,
+        logger: logging.Logger,
+) -> None:
+    """
+    Logs the archive size and compression ratio, and deletes the source directory if requested.
+
+    Args:
+        source_directory (Union[str, pathlib.Path]): The path to the source directory that was archived.
+        archive_path (Union[str, pathlib.Path]): The path to the archive file that was created, minus the extension.
+        archive_format (ArchiveFormat): The format of the archive.
+        directory_size (ByteSize): The size of the source directory.
+        delete (bool): Flag indicating whether to delete the source directory after archiving.
+        logger (logging.Logger): The logger object to handle log messages.
+
+    Returns:
+        None
+    """
+
+    # Log the completion of the archiving process
+    logger.info('Archive created at: %s', archive_path)
+
+    archive_output_filepath = Path(f'{archive_path}.{archive_format.value}')
+
+    # get the size of the compressed archive
+    archive_size = get_file_size(archive_output_filepath)
+
+    # if there was no error calculating archive size, print it out
+    if archive_size:
+
+        # get the size of the archive file
+        logger.info('Archive Size: %s', archive_size)
+
+        # print out the compression ratio
+        logger.info('Compression Ratio: %.2f', directory_size / archive_size)
+
+    # if we are deleting source after archiving, say so and do it
+    if delete:
+
+        # log delete
+        logger.info('Deleting Source Directory: %s', source_directory)
+
+        # delete source dir
+        shutil.rmtree(source_directory)
+
+
+def _get_partial_archive_path(archive_path: Union[str, pathlib.Path]) -> Path:
+    """
+    Gets the temporary path an archive is written to until it is complete, next to the archive in the output directory.
+
+    Args:
+        archive_path (Union[str, pathlib.Path]): The path to the archive file, minus the extension.
+
+    Returns:
+        Path: The path to write the archive to, minus the extension.
+    """
+
+    archive_path = Path(archive_path)
+
+    return archive_path.with_name(f'.{archive_path.name}.partial')
+
+
+@contextlib.contextmanager
+def _partial_archive(archive_path: Union[str, pathlib.Path], archive_format: ArchiveFormat) -> Iterator[Path]:
+    """
+    Context manager giving the partial path to create an archive under, and moving it over the archive path
+    only once the block completes.
+
+    A failed or interrupted archiver never touches an existing archive, and only its partial file is removed.
+
+    Args:
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created, minus the extension.
+        archive_format (ArchiveFormat): The format of the archive.
+
+    Returns:
+        Iterator[Path]: The path to write the archive to, minus the extension.
+    """
+
+    partial_path = _get_partial_archive_path(archive_path)
+    partial_filepath = f'{partial_path}.{archive_format.value}'
+
+    try:
+        yield partial_path
+
+    except BaseException:
+        try:
+            os.unlink(partial_filepath)
+
+        # the archiver may have failed before creating the file
+        except FileNotFoundError:
+            pass
+
+        raise
+
+    # atomic within the output directory, so the archive is either the old one or the complete new one
+    os.replace(partial_filepath, f'{archive_path}.{archive_format.value}')
+
+
 def archive_directory(
         source_directory: Union[str, pathlib.Path],
         archive_path: Union[str, pathlib.Path],
@@ -104,7 +542,9 @@ def archive_directory(
         archive_format: ArchiveFormat,
         logger: logging.Logger,
         delete: bool,
-) -> None:
+        compression_level: Union[int, None] = None,
+        directory_size: Union[ByteSize, None] = None,
+) -> bool:
     """
     Archives a source directory into the specified archive file.
 
@@ -116,9 +556,13 @@ def archive_directory(
         archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.ZIP, ArchiveFormat.TAR).
         logger (logging.Logger): The logger object to handle log messages.
         delete (bool): Flag indicating whether to delete the source directory after archiving.
+        compression_level (Union[int, None], optional): The compression level for compressed tar formats.
+            Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+        directory_size (Union[ByteSize, None], optional): The size of the source directory, if already measured.
+            Defaults to None, walking the directory for it.
 
     Returns:
-        None: The function does not return any value.
+        bool: True if the archive was created, False if an error occurred.
 
     Raises:
         Exception: If an error occurs during the archiving process, it is caught and logged.
@@ -128,54 +572,316 @@ def archive_directory(
     """
 
     try:
-        # Log the start of the archiving process
-        logging.info(f'Starting archive creation from source directory: {source_directory}')
-
-        # get the size of the source directory
-        directory_size = get_folder_size(source_directory)
+        directory_size = _log_directory_size(source_directory, logger, directory_size)
 
-        # if there was no error during calculating source directory size, print it out
-        if directory_size:
-            # print the size of the original directory
-            logging.info(f'Original Directory Size: {directory_size:.2f}')
+        # Create the archive with the archiver for the format, leaving any existing archive in place if it fails
+        with _partial_archive(archive_path, archive_format) as partial_path:
+            ARCHIVERS[archive_format](partial_path, root_dir, base_dir, compression_level, logger)
 
-        # Convert the ArchiveFormat enum back to a string
-        archive_format_str = archive_format.name.lower()
+        _finish_archive(source_directory, archive_path, archive_format, directory_size, delete, logger)
 
-        # Create the archive
-        shutil.make_archive(archive_path, archive_format_str, root_dir, base_dir, logger=logger)
+    except Exception as e:
+        # log any errors during archiving
+        logger.error("An error occurred during archiving: %s", e)
+        return False
 
-        # Log the completion of the archiving process
-        logging.info(f'Archive created at: {archive_path}')
+    return True
 
-        archive_output_filepath = Path(f'{base_dir}.{archive_format.value}')
 
-        # get the size of the compressed archive
-        archive_size = get_file_size(archive_output_filepath)
+async def archive_directory_async(
+        source_directory: Union[str, pathlib.Path],
+        archive_path: Union[str, pathlib.Path],
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        logger: logging.Logger,
+        delete: bool,
+        compression_level: Union[int, None] = None,
+        directory_size: Union[ByteSize, None] = None,
+) -> bool:
+    """
+    Asyncio version of archive_directory, creating the archive with external tools only.
 
-        # if there was no error calculating archive size, print it out
-        if archive_size:
+    The directory walks run in a thread so they don't block the event loop.
 
-            # get the size of the archive file
-            logging.info(f'Archive Size: {archive_size:.2f}')
+    Args:
+        source_directory (Union[str, pathlib.Path]): The path to the source directory to be archived.
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created.
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        archive_format (ArchiveFormat): The format of the archive (e.g., ArchiveFormat.TAR, ArchiveFormat.GZTAR).
+        logger (logging.Logger): The logger object to handle log messages.
+        delete (bool): Flag indicating whether to delete the source directory after archiving.
+        compression_level (Union[int, None], optional): The compression level for compressed tar formats.
+        directory_size (Union[ByteSize, None], optional): The size of the source directory, if already measured.
+            Defaults to None, walking the directory for it.
 
-            # print out the compression ratio
-            logging.info(f'Compression Ratio: {(directory_size/archive_size):.2f}')
+    Returns:
+        bool: True if the archive was created, False if an error occurred.
+    """
 
-        # if we are deleting source after archiving, say so and do it
-        if delete:
+    try:
+        directory_size = await asyncio.to_thread(_log_directory_size, source_directory, logger, directory_size)
 
-            # log delete
-            logging.info(f'Deleting Source Directory: {source_directory}')
+        # leave any existing archive in place if the pipeline fails
+        with _partial_archive(archive_path, archive_format) as partial_path:
+            await compress_with_external_tool_async(partial_path, root_dir, base_dir, archive_format, compression_level)
 
-            # delete source dir
-            shutil.rmtree(source_directory)
+        await asyncio.to_thread(_finish_archive, source_directory, archive_path, archive_format, directory_size, delete, logger)
 
     except Exception as e:
         # log any errors during archiving
-        logger.error(f"An error occurred during archiving: {str(e)}")
+        logger.error("An error occurred during archiving: %s", e)
+        return False
+
+    return True
+
+
+async def archive_directories_async(
+        tasks: List[Tuple[str, Path, Path, str]],
+        archive_format: ArchiveFormat,
+        logger: logging.Logger,
+        delete: bool,
+        compression_level: Union[int, None],
+        max_workers: int,
+        directory_sizes: Union[Dict[str, ByteSize], None] = None,
+) -> List[Tuple[str, bool]]:
+    """
+    Archives every task with external tools, running at most max_workers pipelines at once.
+
+    Overlaps the startup of the tar/compressor processes with the I/O of the running ones,
+    which matters when archiving many small directories.
+
+    Args:
+        tasks (List[Tuple[str, Path, Path, str]]): (source_directory, archive_path, root_dir, base_dir) tuples.
+        archive_format (ArchiveFormat): The format of the archive.
+        logger (logging.Logger): The logger object to handle log messages.
+        delete (bool): Flag indicating whether to delete source directories after archiving.
+        compression_level (Union[int, None]): The compression level for compressed tar formats.
+        max_workers (int): The maximum number of archives to create at once.
+        directory_sizes (Union[Dict[str, ByteSize], None], optional): The already measured size of each source directory.
+            Defaults to None, walking each directory for it.
+
+    Returns:
+        List[Tuple[str, bool]]: (source_directory, whether the archive was created) for every task.
+    """
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    if directory_sizes is None:
+        directory_sizes = {}
+
+    async def run(source_directory, archive_path, root_dir, base_dir):
+        async with semaphore:
+            archived = await archive_directory_async(
+                source_directory,
+                archive_path,
+                root_dir,
+                base_dir,
+                archive_format,
+                logger,
+                delete,
+                compression_level,
+                directory_sizes.get(source_directory)
+            )
+
+            # log the result of each task as it finishes
+            logger.info('Finished archiving: %s', source_directory)
+
+            return source_directory, archived
+
+    return await asyncio.gather(*(run(*task) for task in tasks))
+
+
+def _archive_worker(
+        source_directory: Union[str, pathlib.Path],
+        archive_path: Union[str, pathlib.Path],
+        root_dir: Union[str, pathlib.Path],
+        base_dir: Union[str, pathlib.Path],
+        archive_format: ArchiveFormat,
+        logger: Union[logging.Logger, None],
+        delete: bool,
+        compression_level: Union[int, None] = None,
+        directory_size: Union[ByteSize, None] = None,
+) -> Tuple[Union[str, pathlib.Path], bool]:
+    """
+    Top-level worker used by the process pool to archive a single source directory.
+
+    Loggers are not picklable, so the parent passes None and the worker re-creates one.
+
+    Args:
+        source_directory (Union[str, pathlib.Path]): The path to the source directory to be archived.
+        archive_path (Union[str, pathlib.Path]): The path to the archive file to be created.
+        root_dir (Union[str, pathlib.Path]): The root directory for the archive.
+        base_dir (Union[str, pathlib.Path]): The base directory within the archive.
+        archive_format (ArchiveFormat): The format of the archive.
+        logger (Union[logging.Logger, None]): The logger object, or None to create one in the worker.
+        delete (bool): Flag indicating whether to delete the source directory after archiving.
+        compression_level (Union[int, None], optional): The compression level for compressed tar formats.
+        directory_size (Union[ByteSize, None], optional): The size of the source directory, if already measured.
+
+    Returns:
+        Tuple[Union[str, pathlib.Path], bool]: The source directory, and whether the archive was created.
+    """
+
+    # re-create the logger inside the worker process
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    archived = archive_directory(
+        source_directory,
+        archive_path,
+        root_dir,
+        base_dir,
+        archive_format,
+        logger,
+        delete,
+        compression_level,
+        directory_size
+    )
+
+    return source_directory, archived
+
+
+def load_archive_manifest(output_directory: Path, logger: logging.Logger) -> Dict[str, Dict[str, str]]:
+    """
+    Load the archive manifest from the output directory.
+
+    Args:
+        output_directory (Path): Directory the archives are output to.
+        logger (logging.Logger): The logger object to handle log messages.
+
+    Returns:
+        Dict[str, Dict[str, str]]: Maps archive file names to their source directory and source fingerprint.
+    """
+
+    manifest_filepath = output_directory / ARCHIVE_MANIFEST_NAME
+
+    try:
+        with open(manifest_filepath, 'r') as manifest_file:
+            return json.load(manifest_file)
+
+    except FileNotFoundError:
+        return {}
+
+    except (OSError, ValueError) as e:
+        # an unreadable manifest only means every archive is treated as stale
+        logger.warning('Could not read archive manifest %s: %s', manifest_filepath, e)
+        return {}
+
+
+def save_archive_manifest(output_directory: Path, manifest: Dict[str, Dict[str, str]]) -> None:
+    """
+    Save the archive manifest to the output directory, replacing the previous one atomically.
+
+    Args:
+        output_directory (Path): Directory the archives are output to.
+        manifest (Dict[str, Dict[str, str]]): Maps archive file names to their source directory and source fingerprint.
+
+    Returns:
+        None
+    """
+
+    manifest_filepath = output_directory / ARCHIVE_MANIFEST_NAME
+    temporary_filepath = manifest_filepath.with_name(f'{manifest_filepath.name}.tmp')
+
+    with open(temporary_filepath, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4, sort_keys=True)
+
+    os.replace(temporary_filepath, manifest_filepath)
+
+
+def check_archive_names(source_directories: List[str]) -> None:
+    """
+    Check that no two source directories share a name, as each is archived to <output_directory>/<name>.<extension>.
+
+    Two such archives would be written to the same file at once, losing one of them.
+
+    Args:
+        source_directories (List[str]): List of source directories to archive.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If two or more source directories have the same name.
+    """
+
+    source_directories_by_name = {}
+
+    for source_directory in source_directories:
+        source_directories_by_name.setdefault(Path(source_directory).name, []).append(source_directory)
+
+    collisions = [
+        f"{name}: {', '.join(str(source_directory) for source_directory in directories)}"
+        for name, directories in source_directories_by_name.items()
+        if len(directories) > 1
+    ]
 
-    return None
+    if collisions:
+        raise ValueError(f"Source directories with the same name would be archived to the same file ({'; '.join(collisions)})")
+
+
+def get_archive_tasks(
+        source_directories: List[str],
+        output_directory: Path,
+        archive_format: ArchiveFormat,
+        overwrite: bool,
+        logger: logging.Logger,
+        manifest: Dict[str, Dict[str, str]],
+        fingerprints: Dict[str, str],
+) -> List[Tuple[str, Path, Path, str]]:
+    """
+    Build the list of archiving tasks, skipping directories whose archive exists and is up to date.
+
+    An archive is up to date if the manifest records the same source fingerprint that the directory has now.
+
+    Args:
+        source_directories (List[str]): List of source directories to archive.
+        output_directory (Path): Directory to output archives.
+        archive_format (ArchiveFormat): Archive format (ZIP, TAR, GZTAR, BZTAR, XZTAR, ZSTD, BROTLI).
+        overwrite (bool): Flag indicating whether to overwrite existing archives.
+        logger (logging.Logger): The logger object to handle log messages.
+        manifest (Dict[str, Dict[str, str]]): The archive manifest loaded from the output directory.
+        fingerprints (Dict[str, str]): The current fingerprint of each source directory.
+
+    Returns:
+        List[Tuple[str, Path, Path, str]]: (source_directory, archive_path, root_dir, base_dir) tuples.
+    """
+
+    tasks = []
+
+    for source_directory in source_directories:
+
+        # build the path once and derive everything else from it
+        source_path = Path(source_directory)
+
+        # base directory, also the base name for the archive (excluding the extension)
+        base_dir = source_path.name
+
+        # Full path for the archive file minus the extension
+        archive_path = output_directory / base_dir
+
+        # if we are not overwriting, check if archive file exists, if it does, skip
+        if not overwrite:
+
+            archive_filepath = Path(f'{archive_path}.{archive_format.value}')
+
+            if archive_filepath.is_file():
+
+                # if the archive already exists and its source hasn't changed, skip it
+                if manifest.get(archive_filepath.name, {}).get('fingerprint') == fingerprints[source_directory]:
+
+                    # log that we skip
+                    logger.info('%s Archive already exists at %s, Skipping...', source_directory, archive_filepath)
+                    continue
+
+                # log that the existing archive is stale
+                logger.info('%s changed since %s was created, Re-archiving...', source_directory, archive_filepath)
+
+        tasks.append((source_directory, archive_path, source_path.parent, base_dir))
+
+    return tasks
 
 
 def main(
@@ -185,6 +891,8 @@ def main(
         overwrite: bool,
         delete_source: bool,
         log_level: int,
+        compression_level: Union[int, None] = None,
+        jobs: int = DEFAULT_JOBS,
 ) -> None:
     """
     The main entry point for the script.
@@ -192,11 +900,14 @@ def main(
     Args:
         source_directories (List[str]): List of source directories to archive.
         output_directory (str): Directory to output archives.
-        archive_format (ArchiveFormat): Archive format (ZIP, TAR, GZTAR, BZTAR, XZTAR).
+        archive_format (ArchiveFormat): Archive format (ZIP, TAR, GZTAR, BZTAR, XZTAR, ZSTD, BROTLI).
         overwrite (bool): Flag indicating whether to overwrite existing archives.
         delete_source (bool): Flag indicating whether to delete source directories after archiving.
         log_level (int): The logging severity level to set. Should be one defined in the logging module
                 (e.g., logging.DEBUG, logging.INFO)
+        compression_level (Union[int, None], optional): Compression level for compressed tar formats.
+            Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+        jobs (int, optional): The maximum number of directories to archive at once. Defaults to DEFAULT_JOBS.
 
     Returns:
         None
@@ -204,87 +915,143 @@ def main(
 
     start_time = time.time()
 
-    logger = setup_logger(output_directory, log_level=log_level, log_type='compression')
-
-    # check if output dir exists, if not create it
     output_directory = Path(output_directory)
 
-    if output_directory.is_dir():
-        # Log output directory exists
-        logging.info(f'Output Directory Exists at: {output_directory}')
+    # create the output directory and its logs directory in one call, a no-op if they already exist
+    os.makedirs(output_directory / 'logs', exist_ok=True)
 
-    else:
-        output_directory.mkdir(parents=True, exist_ok=True)
-        # Log create output directory
-        logging.info(f'Output Directory created at: {output_directory}')
+    logger = setup_logger(output_directory, log_level=log_level, log_type='compression')
+
+    # Log the output directory
+    logger.info('Output Directory: %s', output_directory)
 
     # Log the amount of directories to archive
-    logging.info(f'Archiving: {len(source_directories)} directories')
+    logger.info('Archiving: %s directories', len(source_directories))
 
     if overwrite:
         # Log whether we will overwrite archives or not
-        logger.info(f'Overwriting existing archives: {overwrite}')
+        logger.info('Overwriting existing archives: %s', overwrite)
 
     if delete_source:
         # log whether we will delete source directories after archiging
-        logging.info(f'Deleting source directories after archiving: {delete_source}')
+        logger.info('Deleting source directories after archiving: %s', delete_source)
 
-    for source_directory in source_directories:
+    # refuse to start if two sources would overwrite each other's archive
+    check_archive_names(source_directories)
 
-        # Specify the base name for the archive (excluding the extension)
-        archive_base_name = Path(source_directory).name
+    # fingerprint every source directory, to skip archives that are up to date and record the new ones.
+    # the walks overlap in a thread pool, and also measure each directory so the workers don't walk it again
+    manifest = load_archive_manifest(output_directory, logger)
 
-        # Full path for the archive file minus the extension
-        archive_path = Path(output_directory, archive_base_name)
+    folder_scans = {}
 
-        # root directory
-        root_dir = Path(source_directory).parent
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(source_directories)))) as executor:
+        futures = {
+            executor.submit(get_folder_fingerprint_and_size, source_directory): source_directory
+            for source_directory in source_directories
+        }
 
-        # base directory
-        base_dir = Path(source_directory).name
+        for future in as_completed(futures):
+            try:
+                folder_scans[futures[future]] = future.result()
 
-        # if we are not overwriting, check if archive file exists, if it does, skip
-        if not overwrite:
+            # e.g. the source was deleted by a previous run with -d, its archive must be left alone rather than re-created
+            except OSError as e:
+                logger.error('Could not read source directory %s, Skipping: %s', futures[future], e)
 
-            archive_filepath = Path(output_directory, f'{base_dir}.{archive_format}')
+    # only the source directories that could be read are archived, in their original order
+    source_directories = [source_directory for source_directory in source_directories if source_directory in folder_scans]
 
-            # if the archive already exists, skip it
-            if archive_filepath.is_file():
+    fingerprints = {source_directory: fingerprint for source_directory, (fingerprint, _) in folder_scans.items()}
+    directory_sizes = {source_directory: directory_size for source_directory, (_, directory_size) in folder_scans.items()}
 
-                # log that we skip
-                logging.info(f'{source_directory} Archive already exists at {archive_filepath}, Skipping...')
-                # remove from list of source directories
-                source_directories.remove(source_directory)
+    # build the list of directories to archive before dispatching any work
+    tasks = get_archive_tasks(source_directories, output_directory, archive_format, overwrite, logger, manifest, fingerprints)
 
-            else:
-                archive_directory(
+    # the source directories whose archives were created
+    archived_source_directories = []
+
+    # bound the number of archives created at once by the number of cores
+    max_workers = min(len(tasks), jobs)
+
+    if tasks and archive_format in EXTERNAL_TOOL_FORMATS:
+
+        # the work happens in tar/compressor subprocesses, so drive them all from one event loop
+        results = asyncio.run(
+            archive_directories_async(tasks, archive_format, logger, delete_source, compression_level, max_workers, directory_sizes)
+        )
+
+        archived_source_directories = [source_directory for source_directory, archived in results if archived]
+
+    elif tasks:
+
+        # archive each source directory in its own process, logging through the parent's log queue
+        with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=setup_worker_logger,
+                initargs=(get_log_queue(), log_level)
+        ) as executor:
+
+            futures = {
+                executor.submit(
+                    _archive_worker,
                     source_directory,
                     archive_path,
                     root_dir,
                     base_dir,
                     archive_format,
-                    logger,
-                    delete_source
-                )
+                    None,
+                    delete_source,
+                    compression_level,
+                    directory_sizes[source_directory]
+                ): source_directory
+                for source_directory, archive_path, root_dir, base_dir in tasks
+            }
 
-        # else if we are overwriting, then archive every file
-        else:
-            archive_directory(
-                source_directory,
-                archive_path,
-                root_dir,
-                base_dir,
-                archive_format,
-                logger,
-                delete_source
-            )
+            for future in as_completed(futures):
+
+                try:
+                    source_directory, archived = future.result()
+
+                    # log the result of each task as it finishes
+                    logger.info('Finished archiving: %s', source_directory)
+
+                    if archived:
+                        archived_source_directories.append(source_directory)
+
+                except Exception as e:
+                    # log any errors raised by the worker process
+                    logger.error("An error occurred while archiving %s: %s", futures[future], e)
+
+    # record the fingerprint each new archive was created from, and forget the archives that failed to be re-created
+    if tasks:
+
+        archived = set(archived_source_directories)
+
+        for source_directory, _, _, base_dir in tasks:
+
+            archive_name = f'{base_dir}.{archive_format.value}'
+
+            if source_directory in archived:
+                manifest[archive_name] = {
+                    'source_directory': str(source_directory),
+                    'fingerprint': fingerprints[source_directory],
+                }
+
+            else:
+                manifest.pop(archive_name, None)
+
+        save_archive_manifest(output_directory, manifest)
 
     end_time = time.time()
     total_time = end_time - start_time
 
     # Log script completion, including total number of archives created
-    logging.info(f'Archiving Directories Finished! Total Archives Created: {len(source_directories)}')
-    logging.info(f'Total Time Elapsed: {get_time_hh_mm_ss(total_time)}')
+    logger.info('Archiving Directories Finished! Total Archives Created: %s', len(archived_source_directories))
+    logger.info('Total Time Elapsed: %s', get_time_hh_mm_ss(total_time))
+
+    # flush the queued log records and stop the listener thread
+    stop_logger()
 
 
 if __name__ == "__main__":
@@ -299,6 +1066,8 @@ if __name__ == "__main__":
     overwrite = args.overwrite
     delete_source = args.delete_source
     log_level = args.log_level
+    compression_level = args.compression_level
+    jobs = args.jobs
 
     # run main function
     main(
@@ -307,5 +1076,7 @@ if __name__ == "__main__":
         archive_format=archive_format,
         overwrite=overwrite,
         delete_source=delete_source,
-        log_level=log_level
+        log_level=log_level,
+        compression_level=compression_level,
+        jobs=jobs
     )
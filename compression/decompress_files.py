@@ -10,19 +10,28 @@ Description:
 
 Usage:
     python script_name.py --source_files <source_archive_1> <source_archive_2> ... --output_directory <output_directory>
-                          [--overwrite] [--delete_source] [--verbose]
+                          [--overwrite] [--delete_source] [--jobs N] [--verbose]
 
 Command Line Arguments:
     --source_files, -s: List of source archive files to unpack.
     --output_directory: Directory to output the unpacked files.
     --overwrite, -o: Flag indicating whether to overwrite existing unpacked archives.
     --delete_source, -d: Flag indicating whether to delete source archives after unpacking.
+    --jobs, -j: Maximum number of archives to unpack at once. Default is the number of cpus, up to 32.
     --verbose, -v: Verbosity flag to control the level of logging. Default is set to WARNING.
 
 Functions:
     - parse_arguments(): Parses command line arguments using argparse and returns the parsed arguments.
-    - unpack_archive(source_file, output_directory, logger, delete): Unpacks a source archive file into the output directory.
-    - main(source_files, output_directory, overwrite, delete_source, log_level): Main function to orchestrate the unpacking process.
+    - extract_archive(source_file, output_directory): Extracts compressed tar archives with tar and a multithreaded
+        decompressor (pigz, pbzip2, pixz) when one is on the PATH, other archives with libarchive-c when it is installed
+        and can read the format, zip and tar archives with a buffered member by member extractor, or shutil.unpack_archive otherwise.
+    - get_unpacked_archive_size(source_file, unpacked_archive_path, output_directory): Gets the size of an unpacked
+        archive from the size cache in the output directory, walking it only if the source archive changed.
+    - unpack_archive(source_file, output_directory, logger): Unpacks a source archive file into the output directory.
+    - delete_source_files(source_files, logger): Deletes the unpacked source archives concurrently from a thread pool.
+    - main(source_files, output_directory, overwrite, delete_source, log_level, jobs): Main function to orchestrate the unpacking process,
+        unpacking archives in parallel across a thread pool when external tools or libarchive can extract them all,
+        or a process pool otherwise.
 
 Logging:
     - The script utilizes the logging module to provide detailed information about the unpacking process.
@@ -39,16 +48,85 @@ Example:
 """
 
 
+import io
+import os
+import sys
+import json
 import pathlib
 import shutil
+import struct
+import subprocess
+import tarfile
+import zipfile
 import logging
 import argparse
 import time
 from datetime import timedelta, datetime
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Tuple
 from enum import Enum
-from utils import get_folder_size, get_file_size, get_time_hh_mm_ss, setup_logger, get_unpacked_archive_directory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from utils import ByteSize, get_folder_size, get_file_size, get_time_hh_mm_ss, setup_logger, get_base_directory, \
+    get_log_queue, setup_worker_logger, stop_logger, ArchiveFormat, libarchive
+
+# fcntl is only available on unix
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# file in the output directory caching the unpacked size of each source archive, so an unchanged archive isn't re-walked
+SIZE_CACHE_NAME = '.size_cache.json'
+
+
+# restore modification times and permissions like tarfile does, and refuse symlinks and .. paths escaping the output directory
+if libarchive is not None:
+    LIBARCHIVE_EXTRACT_FLAGS = (
+        libarchive.extract.EXTRACT_TIME
+        | libarchive.extract.EXTRACT_PERM
+        | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+        | libarchive.extract.EXTRACT_SECURE_NODOTDOT
+    )
+
+# archive formats libarchive cannot read, which are left to shutil
+LIBARCHIVE_UNSUPPORTED_SUFFIXES = (f'.{ArchiveFormat.BROTLI.value}',)
+
+# size of the buffer each archive's members are copied through, one is allocated per archive and reused for every member
+EXTRACT_BUFSIZE = 1024 * 1024
+
+# archive formats extracted member by member with zipfile and tarfile when neither the external tools nor libarchive can
+ZIP_SUFFIX = f'.{ArchiveFormat.ZIP.value}'
+TARFILE_SUFFIXES = tuple(
+    f'.{archive_format.value}'
+    for archive_format in (ArchiveFormat.TAR, ArchiveFormat.GZTAR, ArchiveFormat.BZTAR, ArchiveFormat.XZTAR)
+)
+
+# stored zip members and uncompressed tar members are copied in kernel space with sendfile on linux,
+# elsewhere (e.g. macos and freebsd) sendfile can only write to a socket
+USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+# signature, filename length, and extra field length of a zip local file header
+ZIP_LOCAL_HEADER_STRUCT = struct.Struct('<4s22xHH')
+ZIP_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+# multithreaded external decompressors used by tar in place of single threaded inflate
+PARALLEL_DECOMPRESSORS = {
+    ArchiveFormat.GZTAR: 'pigz',
+    ArchiveFormat.BZTAR: 'pbzip2',
+    ArchiveFormat.XZTAR: 'pixz',
+}
+
+# the decompressors that are on the PATH (along with tar), looked up once at import rather than per archive
+AVAILABLE_PARALLEL_DECOMPRESSORS = {
+    archive_format: decompressor
+    for archive_format, decompressor in PARALLEL_DECOMPRESSORS.items()
+    if shutil.which('tar') and shutil.which(decompressor)
+}
+
+
+# default number of archives to unpack at once, past ~16 workers the disk rather than the cpu is the bottleneck
+DEFAULT_JOBS = min(32, os.cpu_count() or 1)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -64,6 +142,7 @@ def parse_arguments() -> argparse.Namespace:
     p.add_argument('--output_directory', required=True, help="directory to output unpacked archives")
     p.add_argument('--overwrite', '-o', action='store_true', help='whether to overwrite an existing unpacked archive')
     p.add_argument('--delete_source', '-d', action='store_true', help='whether to delete source archives after unpacking')
+    p.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS, help=f'maximum number of archives to unpack at once (default {DEFAULT_JOBS})')
     p.add_argument(
                    '-v', '--verbose',
                    help='Be verbose',
@@ -75,79 +154,633 @@ def parse_arguments() -> argparse.Namespace:
 
     args = p.parse_args()
 
+    if args.jobs < 1:
+        raise ValueError(f"Invalid number of jobs: {args.jobs}, expected at least 1")
+
     return args
 
 
+def get_parallel_decompressor(source_file: Union[str, pathlib.Path]) -> Union[str, None]:
+    """
+    Gets the multithreaded decompressor to extract a compressed tar archive with, if one is on the PATH.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+
+    Returns:
+        Union[str, None]: The decompressor to pass to tar, or None if there is none for the archive's format.
+    """
+
+    for archive_format, decompressor in AVAILABLE_PARALLEL_DECOMPRESSORS.items():
+        if str(source_file).endswith(f'.{archive_format.value}'):
+            return decompressor
+
+    return None
+
+
+def can_extract_with_libarchive(source_file: Union[str, pathlib.Path]) -> bool:
+    """
+    Checks whether the source archive can be extracted with libarchive.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+
+    Returns:
+        bool: True if libarchive-c is installed and can read the archive's format, False otherwise.
+    """
+
+    return libarchive is not None and not str(source_file).endswith(LIBARCHIVE_UNSUPPORTED_SUFFIXES)
+
+
+def _get_member_path(
+        source_file: Union[str, pathlib.Path],
+        output_directory: Union[str, pathlib.Path],
+        member_name: str,
+) -> str:
+    """
+    Gets the path an archive member is extracted to.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+        member_name (str): The member's path within the archive.
+
+    Returns:
+        str: The path to extract the member to.
+
+    Raises:
+        ValueError: If the member has an absolute path or a path containing '..', and would be written outside the output directory.
+    """
+
+    if os.path.isabs(member_name) or '..' in Path(member_name).parts:
+        raise ValueError(f'Unsafe path in archive {source_file}: {member_name}')
+
+    return os.path.join(output_directory, member_name)
+
+
+class DirCache:
+    """
+    Remembers the directories that exist while extracting an archive, so each one is only created once.
+
+    zipfile and tarfile call os.makedirs for every member, which costs a mkdir per ancestor per file.
+
+    Attributes:
+        _seen (set): The directories known to exist.
+    """
+
+    def __init__(self, output_directory: Union[str, pathlib.Path]):
+        # the output directory already exists. paths are kept absolute, so a relative output directory like '.'
+        # and the member paths under it normalize to the same ancestors
+        self._seen = {os.path.abspath(output_directory)}
+
+    def ensure(self, path: str) -> None:
+        """
+        Creates a directory and any missing parents, skipping the ones already seen.
+
+        Args:
+            path (str): The directory to create.
+
+        Returns:
+            None
+        """
+
+        path = os.path.abspath(path)
+
+        # walk up until we reach a directory we know exists
+        missing = []
+
+        while path not in self._seen:
+            missing.append(path)
+            parent = os.path.dirname(path)
+
+            if parent == path:
+                break
+
+            path = parent
+
+        # create them top down
+        for directory in reversed(missing):
+            try:
+                os.mkdir(directory)
+
+            # e.g. when overwriting a previous unpack
+            except FileExistsError:
+                pass
+
+            self._seen.add(directory)
+
+
+def _copy_member(source, member_path: str, mode: int, buffer: bytearray) -> None:
+    """
+    Copies an archive member's contents into a new file through a reusable buffer.
+
+    Args:
+        source: The member's open file object, supporting readinto.
+        member_path (str): The path to write the member to.
+        mode (int): The permissions to create the file with.
+        buffer (bytearray): The buffer to copy through, reused across the archive's members.
+
+    Returns:
+        None
+    """
+
+    view = memoryview(buffer)
+
+    # create the file with its permissions in one call, and write unbuffered since we write whole buffers
+    file_descriptor = os.open(member_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+
+    with open(file_descriptor, 'wb', buffering=0) as destination:
+        while True:
+            read_size = source.readinto(buffer)
+
+            if not read_size:
+                break
+
+            # unbuffered writes can be partial
+            written = 0
+            while written < read_size:
+                written += destination.write(view[written:read_size])
+
+
+def _sendfile_member(source_fd: int, offset: int, size: int, member_path: str, mode: int) -> None:
+    """
+    Copies a member stored byte for byte in the archive into a new file with sendfile, without passing through python.
+
+    Args:
+        source_fd (int): File descriptor of the open archive.
+        offset (int): Offset of the member's data in the archive.
+        size (int): Size of the member's data.
+        member_path (str): The path to write the member to.
+        mode (int): The permissions to create the file with.
+
+    Returns:
+        None
+
+    Raises:
+        EOFError: If the archive ends before the member's data does.
+    """
+
+    file_descriptor = os.open(member_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+
+    try:
+        # sendfile can copy less than asked for
+        while size > 0:
+            sent = os.sendfile(file_descriptor, source_fd, offset, size)
+
+            if not sent:
+                raise EOFError(f'Archive ended before the data of {member_path}')
+
+            offset += sent
+            size -= sent
+
+    finally:
+        os.close(file_descriptor)
+
+
+def _get_zip_data_offset(source_fd: int, member: zipfile.ZipInfo) -> int:
+    """
+    Gets the offset of a zip member's data, which follows its local file header.
+
+    The local header's extra field can differ from the central directory's, so it is read from the archive.
+
+    Args:
+        source_fd (int): File descriptor of the open zip archive.
+        member (zipfile.ZipInfo): The member.
+
+    Returns:
+        int: Offset of the member's data in the archive.
+
+    Raises:
+        zipfile.BadZipFile: If there is no local file header at the member's header offset.
+    """
+
+    local_header = os.pread(source_fd, ZIP_LOCAL_HEADER_STRUCT.size, member.header_offset)
+
+    if len(local_header) < ZIP_LOCAL_HEADER_STRUCT.size:
+        raise zipfile.BadZipFile(f'Truncated local file header for {member.filename}')
+
+    signature, filename_length, extra_length = ZIP_LOCAL_HEADER_STRUCT.unpack(local_header)
+
+    if signature != ZIP_LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f'Bad local file header for {member.filename}')
+
+    return member.header_offset + ZIP_LOCAL_HEADER_STRUCT.size + filename_length + extra_length
+
+
+def _extract_zip(source_file: Union[str, pathlib.Path], output_directory: Union[str, pathlib.Path], buffer: bytearray) -> None:
+    """
+    Extracts a zip archive member by member, copying through the given buffer and creating directories through a DirCache.
+
+    Stored (uncompressed, unencrypted) members are copied with sendfile instead, skipping zipfile's CRC check.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+        buffer (bytearray): The buffer to copy every member through.
+
+    Returns:
+        None
+    """
+
+    dir_cache = DirCache(output_directory)
+
+    with zipfile.ZipFile(source_file) as archive:
+        for member in archive.infolist():
+
+            member_path = _get_member_path(source_file, output_directory, member.filename)
+
+            if member.is_dir():
+                dir_cache.ensure(member_path)
+                continue
+
+            dir_cache.ensure(os.path.dirname(member_path))
+
+            # stored members are byte for byte copies of the archive's data
+            if USE_SENDFILE and member.compress_type == zipfile.ZIP_STORED and not member.flag_bits & 0x1:
+                source_fd = archive.fp.fileno()
+                _sendfile_member(source_fd, _get_zip_data_offset(source_fd, member), member.file_size, member_path, 0o644)
+                continue
+
+            with archive.open(member) as source:
+                _copy_member(source, member_path, 0o644, buffer)
+
+
+def _extract_tar(source_file: Union[str, pathlib.Path], output_directory: Union[str, pathlib.Path], buffer: bytearray) -> None:
+    """
+    Extracts a tar archive member by member, copying regular files through the given buffer.
+
+    In uncompressed tar archives, regular files are copied with sendfile instead.
+    Directories are created through a DirCache, and their modes and times set once all their contents are written, like extractall does.
+    Links and special files are left to tarfile, with its data filter where this python has one.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+        buffer (bytearray): The buffer to copy every regular file through.
+
+    Returns:
+        None
+    """
+
+    dir_cache = DirCache(output_directory)
+
+    # directory members, whose modes and times are set after the rest of the archive is extracted
+    directories = []
+
+    with tarfile.open(source_file) as archive:
+
+        # members of an uncompressed tar are stored byte for byte at their data offsets in the file. tarfile detects
+        # the compression from the contents rather than the suffix, and only reads uncompressed tars from the raw file
+        use_sendfile = USE_SENDFILE and isinstance(archive.fileobj, io.BufferedReader)
+
+        # refuse links and special files that point outside the output directory
+        if hasattr(tarfile, 'data_filter'):
+            archive.extraction_filter = tarfile.data_filter
+
+        for member in archive:
+
+            member_path = _get_member_path(source_file, output_directory, member.name)
+
+            # a read only directory's mode can't be applied until its contents are written
+            if member.isdir():
+                dir_cache.ensure(member_path)
+
+                # set the attributes tarfile's data filter would, where this python has one
+                if hasattr(tarfile, 'data_filter'):
+                    member = tarfile.data_filter(member, output_directory)
+
+                directories.append((member_path, member))
+                continue
+
+            if not member.isreg():
+                archive.extract(member, output_directory)
+                continue
+
+            dir_cache.ensure(os.path.dirname(member_path))
+
+            # drop setuid/setgid/sticky and group/other write bits, like tarfile's data filter
+            if use_sendfile and not member.issparse():
+                _sendfile_member(archive.fileobj.fileno(), member.offset_data, member.size, member_path, member.mode & 0o755)
+
+            else:
+                with archive.extractfile(member) as source:
+                    _copy_member(source, member_path, member.mode & 0o755, buffer)
+
+            os.utime(member_path, (member.mtime, member.mtime))
+
+    # deepest directories first, so setting a directory's time isn't undone by setting its children's
+    for directory_path, member in sorted(directories, key=lambda directory: directory[0], reverse=True):
+
+        # tarfile's data filter ignores directory modes, leaving them as created
+        if member.mode is not None:
+            os.chmod(directory_path, member.mode & 0o755)
+
+        os.utime(directory_path, (member.mtime, member.mtime))
+
+
+def _extract_libarchive(source_file: Union[str, pathlib.Path], output_directory: Union[str, pathlib.Path]) -> None:
+    """
+    Extracts the source archive into the output directory with libarchive, which inflates in C with the GIL released.
+
+    Entry paths are rewritten to be under the output directory rather than changing the working directory,
+    which is shared by every thread in the process.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If an entry, or a hard link's target, has an absolute path or a path containing '..'.
+    """
+
+    output_directory = os.path.abspath(output_directory)
+
+    def entries():
+        with libarchive.file_reader(str(source_file)) as archive:
+            for entry in archive:
+
+                entry.pathname = _get_member_path(source_file, output_directory, entry.pathname)
+
+                # hard link targets are archive paths too, and can't point outside the output directory either
+                if entry.islnk:
+                    entry.linkpath = _get_member_path(source_file, output_directory, entry.linkpath)
+
+                yield entry
+
+    libarchive.extract.extract_entries(entries(), LIBARCHIVE_EXTRACT_FLAGS)
+
+
+def extract_archive(source_file: Union[str, pathlib.Path], output_directory: Union[str, pathlib.Path]) -> None:
+    """
+    Extracts the source archive into the output directory.
+
+    Compressed tar archives are piped through a multithreaded decompressor (pigz, pbzip2, pixz) when one is on the PATH,
+    other archives are extracted with libarchive when it can read the format. Without libarchive, zip and
+    tar archives are extracted member by member through one large buffer, and anything else with shutil.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+
+    Returns:
+        None
+    """
+
+    decompressor = get_parallel_decompressor(source_file)
+
+    if decompressor is not None:
+        # tar runs the decompressor with -d and reads the tar stream from its stdout
+        subprocess.run(
+            ['tar', f'--use-compress-program={decompressor}', '-xf', str(source_file), '-C', str(output_directory)],
+            check=True
+        )
+
+    elif can_extract_with_libarchive(source_file):
+        _extract_libarchive(source_file, output_directory)
+
+    elif str(source_file).endswith(ZIP_SUFFIX):
+        _extract_zip(source_file, output_directory, bytearray(EXTRACT_BUFSIZE))
+
+    elif str(source_file).endswith(TARFILE_SUFFIXES):
+        _extract_tar(source_file, output_directory, bytearray(EXTRACT_BUFSIZE))
+
+    else:
+        shutil.unpack_archive(source_file, output_directory)
+
+
+def _lock_file(file) -> None:
+    """
+    Takes an exclusive lock on an open file, released when the file is closed.
+
+    Workers unpack in parallel, so this keeps their reads and writes of the size cache from interleaving.
+    Without fcntl (e.g. on Windows) the file is left unlocked.
+
+    Args:
+        file: The open file to lock.
+
+    Returns:
+        None
+    """
+
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+def _read_size_cache(cache_file) -> dict:
+    """
+    Reads the size cache from the start of an open cache file.
+
+    Args:
+        cache_file: The open size cache file.
+
+    Returns:
+        dict: Maps source archive keys to their unpacked size in bytes, empty if the cache is empty or unreadable.
+    """
+
+    cache_file.seek(0)
+
+    try:
+        return json.loads(cache_file.read() or '{}')
+
+    # an unreadable cache only means sizes are re-walked
+    except ValueError:
+        return {}
+
+
+def get_unpacked_archive_size(
+        source_file: Union[str, pathlib.Path],
+        unpacked_archive_path: Union[str, pathlib.Path],
+        output_directory: Union[str, pathlib.Path],
+) -> Union[ByteSize, None]:
+    """
+    Gets the size of an unpacked archive, from the output directory's size cache if the source archive hasn't changed.
+
+    The cache is keyed on the source archive's path, modification time, and size, so a changed archive is re-walked.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file, which must still exist.
+        unpacked_archive_path (Union[str, pathlib.Path]): Path to the unpacked archive directory.
+        output_directory (Union[str, pathlib.Path]): Directory the archives are unpacked to, holding the size cache.
+
+    Returns:
+        Union[ByteSize, None]: The size of the unpacked archive, or None if it couldn't be calculated.
+    """
+
+    cache_filepath = Path(output_directory, SIZE_CACHE_NAME)
+
+    source_stat = os.stat(source_file)
+    key = f'{os.path.abspath(source_file)}:{source_stat.st_mtime_ns}:{source_stat.st_size}'
+
+    # look the source archive up in the cache
+    with open(cache_filepath, 'a+') as cache_file:
+        _lock_file(cache_file)
+        cached_size = _read_size_cache(cache_file).get(key)
+
+    if cached_size is not None:
+        return ByteSize(cached_size)
+
+    # walk the unpacked archive without holding the lock, so other workers aren't blocked
+    unpacked_archive_size = get_folder_size(unpacked_archive_path)
+
+    if unpacked_archive_size is None:
+        return None
+
+    # re-read the cache under the lock before writing, other workers may have added to it since
+    with open(cache_filepath, 'a+') as cache_file:
+        _lock_file(cache_file)
+
+        cache = _read_size_cache(cache_file)
+        cache[key] = int(unpacked_archive_size)
+
+        cache_file.seek(0)
+        cache_file.truncate()
+        json.dump(cache, cache_file)
+
+    return unpacked_archive_size
+
+
 def unpack_archive(
         source_file: Union[str, pathlib.Path],
         output_directory: Union[str, pathlib.Path],
         logger: logging.Logger,
-        delete: bool,
-) -> None:
+) -> bool:
     """
     Unpacks the given source archive file into the specified output directory.
 
+    Source archives are deleted afterwards by main, in one batch, once every archive is unpacked.
+    Errors reporting the unpacked size are logged but don't fail the unpack, since the archive was still extracted.
+
     Args:
         source_file (Union[str, pathlib.Path]): Path to the source archive file.
         output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
         logger (logging.Logger): Logger object for logging messages.
-        delete (bool): Whether to delete the source archive file after unpacking.
 
     Returns:
-        None
+        bool: True if the archive was unpacked, False if an error occurred.
     """
 
+    # build the paths once, up front
+    source_file = Path(source_file)
+    output_directory = Path(output_directory)
+
     try:
         # Log the start of the unpacking process
-        logging.info(f'Starting unpacking archive from file: {source_file}')
+        logger.info('Starting unpacking archive from file: %s', source_file)
 
-        # get the size of the archive file
-        archive_size = get_file_size(source_file)
+        # sizes are only reported at INFO, so skip the stat and the walk of the unpacked archive otherwise
+        report_sizes = logger.isEnabledFor(logging.INFO)
 
-        # if there was no error during calculating source archive size, print it out
-        if archive_size:
-            # print the size of the original directory
-            logging.info(f'Original Archive Size: {archive_size:.2f}')
+        if report_sizes:
 
-        # # Unpack the archive
-        shutil.unpack_archive(source_file, output_directory)
+            # get the size of the archive file
+            archive_size = get_file_size(source_file)
 
-        # Get the directory of the unpacked archive
-        unpacked_archive_directory = get_base_directory(source_file)
+            # if there was no error during calculating source archive size, print it out
+            if archive_size:
+                # print the size of the original directory
+                logger.info('Original Archive Size: %s', archive_size)
 
-        # get the whole output archive path
-        output_archive_path = Path(output_directory, Path(unpacked_archive_directory).stem)
+        # # Unpack the archive
+        extract_archive(source_file, output_directory)
+
+        # get the whole output archive path, from the name of the archive without its archive suffixes
+        output_archive_path = output_directory / get_base_directory(source_file).name
 
         # Log the completion of the archiving process
-        logging.info(f'Unpacked Archive created at: {output_archive_path}')
+        logger.info('Unpacked Archive created at: %s', output_archive_path)
 
-        # get the size of the compressed archive
-        unpacked_archive_size = get_folder_size(output_archive_path)
+    except Exception as e:
+        # log any errors during unpacking
+        logger.error('An error occurred during unpacking: %s', e)
+        return False
 
-        # if there was no error calculating archive size, print it out
-        if unpacked_archive_size:
+    if report_sizes:
 
-            # get the size of the archive file
-            logging.info(f'Unpacked Archive Size: {unpacked_archive_size:.2f}')
+        try:
+            # get the size of the unpacked archive, cached across runs
+            unpacked_archive_size = get_unpacked_archive_size(source_file, output_archive_path, output_directory)
 
-            # print out the decompression ratio
-            logging.info(f'Decompression Ratio: {(unpacked_archive_size/archive_size):.2f}')
+            # if there was no error calculating archive size, print it out
+            if unpacked_archive_size:
 
-        # if we are deleting source after archiving, say so and do it
-        if delete:
+                # get the size of the archive file
+                logger.info('Unpacked Archive Size: %s', unpacked_archive_size)
 
-            # log delete
-            logging.info(f'Deleting Source Archive File: {source_file}')
+                # print out the decompression ratio
+                if archive_size:
+                    logger.info('Decompression Ratio: %.2f', unpacked_archive_size / archive_size)
 
-            # delete source file
-            if Path(source_file).is_file():
-                shutil.unlink(source_file, missing_ok=True)
+        except Exception as e:
+            # e.g. the archive's top level directory isn't named after the archive, the unpack itself still succeeded
+            logger.warning('Could not get the unpacked size of %s: %s', source_file, e)
 
-    except Exception as e:
-        # log any errors during unpacking
-        logger.error(f"An error occurred during unpacking: {str(e)}")
+    return True
 
-    return None
+
+def delete_source_files(source_files: List[pathlib.Path], logger: logging.Logger) -> None:
+    """
+    Deletes the source archive files, issuing the unlinks from a thread pool so their latency overlaps,
+    which matters most on network file systems.
+
+    Args:
+        source_files (List[pathlib.Path]): The source archive files to delete.
+        logger (logging.Logger): Logger object for logging messages.
+
+    Returns:
+        None
+    """
+
+    def delete(source_file):
+        # log delete
+        logger.info('Deleting Source Archive File: %s', source_file)
+
+        try:
+            os.unlink(source_file)
+
+        # already gone
+        except FileNotFoundError:
+            pass
+
+        except OSError as e:
+            logger.error('An error occurred while deleting %s: %s', source_file, e)
+
+    with ThreadPoolExecutor(max_workers=min(32, len(source_files))) as executor:
+        list(executor.map(delete, source_files))
+
+
+def _unpack_worker(
+        source_file: Union[str, pathlib.Path],
+        output_directory: Union[str, pathlib.Path],
+        logger: Union[logging.Logger, None],
+) -> Tuple[Union[str, pathlib.Path], bool]:
+    """
+    Top-level worker used by the process pool to unpack a single source archive.
+
+    Loggers are not picklable, so the parent passes None and the worker re-creates one.
+
+    Args:
+        source_file (Union[str, pathlib.Path]): Path to the source archive file.
+        output_directory (Union[str, pathlib.Path]): Directory to output the unpacked files.
+        logger (Union[logging.Logger, None]): The logger object, or None to create one in the worker.
+
+    Returns:
+        Tuple[Union[str, pathlib.Path], bool]: The source archive, and whether it was unpacked.
+    """
+
+    # re-create the logger inside the worker process
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    unpacked = unpack_archive(
+        source_file,
+        output_directory,
+        logger
+    )
+
+    return source_file, unpacked
 
 
 def main(
@@ -156,6 +789,7 @@ def main(
         overwrite: bool,
         delete_source: bool,
         log_level: int,
+        jobs: int = DEFAULT_JOBS,
 ) -> None:
     """
     Main function to unpack archives based on provided command line arguments.
@@ -166,6 +800,7 @@ def main(
         overwrite (bool): Whether to overwrite existing unpacked archives.
         delete_source (bool): Whether to delete source archives after unpacking.
         log_level (int): Logging severity level.
+        jobs (int, optional): The maximum number of archives to unpack at once. Defaults to DEFAULT_JOBS.
 
     Returns:
         None
@@ -173,71 +808,107 @@ def main(
 
     start_time = time.time()
 
-    logger = setup_logger(output_directory, log_level=log_level, log_type='decompression')
-
-    # check if output dir exists, if not create it
     output_directory = Path(output_directory)
 
-    if output_directory.is_dir():
-        # Log output directory exists
-        logging.info(f'Output Directory Exists at: {output_directory}')
+    # create the output directory and its logs directory in one call, a no-op if they already exist
+    os.makedirs(output_directory / 'logs', exist_ok=True)
 
-    else:
-        output_directory.mkdir(parents=True, exist_ok=True)
-        # Log create output directory
-        logging.info(f'Output Directory created at: {output_directory}')
+    logger = setup_logger(output_directory, log_level=log_level, log_type='decompression')
+
+    # Log the output directory
+    logger.info('Output Directory: %s', output_directory)
 
     # Log the amount of archived to unpack
-    logging.info(f'Unpacking: {len(source_files)} archives')
+    logger.info('Unpacking: %s archives', len(source_files))
 
     if overwrite:
         # Log whether we will overwrite archives or not
-        logger.info(f'Overwriting existing unpacked archives: {overwrite}')
+        logger.info('Overwriting existing unpacked archives: %s', overwrite)
 
     if delete_source:
         # log whether we will delete source directories after archiging
-        logging.info(f'Deleting source archives after unpacking: {delete_source}')
+        logger.info('Deleting source archives after unpacking: %s', delete_source)
+
+    source_files = [Path(source_file) for source_file in source_files]
+
+    # where each archive is unpacked to, built once for both the skip check and its log message
+    unpacked_archive_filepaths = {
+        source_file: output_directory / get_base_directory(source_file).name
+        for source_file in source_files
+    }
+
+    # the archives to unpack, built in one pass before dispatching any work.
+    # if we are not overwriting, skip archives whose unpacked archive directory exists
+    to_unpack = [
+        source_file for source_file in source_files
+        if overwrite or not unpacked_archive_filepaths[source_file].is_dir()
+    ]
+
+    # log the skipped archives separately, in their original order
+    skip_set = set(source_files).difference(to_unpack)
 
     for source_file in source_files:
+        if source_file in skip_set:
+            logger.info('%s: unpacked archive already exists at %s, Skipping...', source_file, unpacked_archive_filepaths[source_file])
 
-        source_file = Path(source_file)
+    # the source archives that were unpacked
+    unpacked_source_files = []
 
-        # if we are not overwriting, check if unpacked archive directory exists, if it does, skip
-        if not overwrite:
+    if to_unpack:
 
-            unpacked_archive_filepath = Path(output_directory, Path(source_file).stem)
+        max_workers = min(len(to_unpack), jobs)
 
-            # if the archive already exists, skip it
-            if unpacked_archive_filepath.is_dir():
+        if all(
+                get_parallel_decompressor(source_file) or can_extract_with_libarchive(source_file)
+                for source_file in to_unpack
+        ):
 
-                # log that we skip
-                logging.info(f'{source_file}: unpacked archive already exists at {unpacked_archive_filepath}, Skipping...')
-                # remove from list of source files
-                source_files.remove(source_file)
+            # external tools and libarchive run without the GIL, so threads unpack in parallel without pickling arguments
+            executor = ThreadPoolExecutor(max_workers=max_workers)
 
-            else:
-                unpack_archive(
-                    source_file,
-                    output_directory,
-                    logger,
-                    delete_source
-                )
-
-        # else if we are overwriting, then archive every file
         else:
-            unpack_archive(
-                source_file,
-                output_directory,
-                logger,
-                delete_source
+
+            # unpack each archive in its own process, logging through the parent's log queue
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=setup_worker_logger,
+                initargs=(get_log_queue(), log_level)
             )
 
+        with executor:
+
+            futures = {
+                executor.submit(_unpack_worker, source_file, output_directory, None): source_file
+                for source_file in to_unpack
+            }
+
+            for future in as_completed(futures):
+
+                try:
+                    source_file, unpacked = future.result()
+
+                    # log the result of each task as it finishes
+                    logger.info('Finished unpacking: %s', source_file)
+
+                    if unpacked:
+                        unpacked_source_files.append(source_file)
+
+                except Exception as e:
+                    logger.error('An error occurred while unpacking %s: %s', futures[future], e)
+
+    # if we are deleting source after unpacking, delete the archives that were unpacked, all at once
+    if delete_source and unpacked_source_files:
+        delete_source_files(unpacked_source_files, logger)
+
     end_time = time.time()
     total_time = end_time - start_time
 
     # Log script completion, including total number of archives created
-    logging.info(f'Unpacking Archives Finished! Total Directories Created: {len(source_file)}')
-    logging.info(f'Total Time Elapsed: {get_time_hh_mm_ss(total_time)}')
+    logger.info('Unpacking Archives Finished! Total Directories Created: %s', len(unpacked_source_files))
+    logger.info('Total Time Elapsed: %s', get_time_hh_mm_ss(total_time))
+
+    # flush the queued log records and stop the listener thread
+    stop_logger()
 
 
 if __name__ == "__main__":
@@ -251,6 +922,7 @@ if __name__ == "__main__":
     overwrite = args.overwrite
     delete_source = args.delete_source
     log_level = args.log_level
+    jobs = args.jobs
 
     # run main function
     main(
@@ -259,4 +931,5 @@ if __name__ == "__main__":
         overwrite=overwrite,
         delete_source=delete_source,
         log_level=log_level,
+        jobs=jobs,
     )
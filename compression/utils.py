@@ -1,12 +1,75 @@
+import os
+import atexit
+import bz2
+import gzip
+import hashlib
+import lzma
 import pathlib
 import shutil
+import stat
+import subprocess
+import tarfile
 import logging
+import logging.handlers
+import multiprocessing
 import argparse
+import re
+import threading
 import time
-from datetime import timedelta, datetime
+from datetime import datetime
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Tuple, Iterator, Iterable
 from enum import Enum
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# libarchive-c raises OSError on import when the libarchive C library itself is missing.
+# decompress_files uses this same handle, including the extract module
+try:
+    import libarchive
+    import libarchive.extract
+except (ImportError, OSError):
+    libarchive = None
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+# number of statx requests submitted to io_uring per syscall
+IO_URING_BATCH_SIZE = 1024
+
+# buffer sizes for reading and writing archives, large enough that each read/write syscall moves megabytes
+COPY_BUFSIZE = 4 * 1024 * 1024
+TAR_BUFSIZE = 1024 * 1024
+
+# shutil copies through a 64KB buffer on linux by default, raise it for shutil's own archive copies
+shutil.COPY_BUFSIZE = COPY_BUFSIZE
+
+# queue that log records are sent through to the listener that owns the real handlers, set by setup_logger
+_log_queue = None
+
+# the listener draining _log_queue, and the root logger's handler feeding it, until stop_logger is called
+_log_listener = None
+_queue_handler = None
+
+# setup_logger only configures logging once per process, until stop_logger is called
+_logger_lock = threading.Lock()
+_configured = False
+
+# rotate log files once they reach this size, keeping this many old ones
+LOG_FILE_MAX_BYTES = 100 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
 
 class ArchiveFormat(Enum):
     """
@@ -21,6 +84,8 @@ class ArchiveFormat(Enum):
         - GZTAR: GZipped TAR archive format.
         - BZTAR: BZipped TAR archive format.
         - XZTAR: XZipped TAR archive format.
+        - ZSTD: Zstandard compressed TAR archive format.
+        - BROTLI: Brotli compressed TAR archive format, for text heavy directories.
 
     Example:
         To use an archive format in the script, you can reference the enum values like this:
@@ -35,16 +100,448 @@ class ArchiveFormat(Enum):
         GZTAR (str): String value representing the GZipped TAR archive format.
         BZTAR (str): String value representing the BZipped TAR archive format.
         XZTAR (str): String value representing the XZipped TAR archive format.
+        ZSTD (str): String value representing the Zstandard compressed TAR archive format.
+        BROTLI (str): String value representing the Brotli compressed TAR archive format.
     """
     ZIP = "zip"
     TAR = "tar"
     GZTAR = "tar.gz"
     BZTAR = "tar.bz2"
     XZTAR = "tar.xz"
+    ZSTD = "tar.zst"
+    BROTLI = "tar.br"
+
+
+# the shutil format name for each archive format, computed once instead of on every archive
+SHUTIL_FORMAT_NAMES = {archive_format: archive_format.name.lower() for archive_format in ArchiveFormat}
+
+# suffixes that archive files end in, stripped to get the name of the unpacked directory
+_ARCHIVE_SUFFIXES = frozenset({'.zip', '.tar', '.gz', '.bz2', '.xz', '.zst', '.br'})
+
+# matches the run of archive suffixes at the end of a file name, leaving at least one character (e.g. '.tar' of '.tar.gz')
+_ARCHIVE_TAIL = re.compile(
+    r'(?<=.)(?:\.(?:' + '|'.join(re.escape(suffix[1:]) for suffix in sorted(_ARCHIVE_SUFFIXES)) + r'))+$',
+    re.IGNORECASE
+)
+
+
+# default compression level for each compressed tar format, chosen for speed over ratio where the two trade off
+DEFAULT_COMPRESSION_LEVELS = {
+    ArchiveFormat.GZTAR: 6,
+    ArchiveFormat.BZTAR: 1,
+    ArchiveFormat.XZTAR: 6,
+    ArchiveFormat.ZSTD: 3,
+    ArchiveFormat.BROTLI: 4,
+}
+
+# libarchive filter for each tar format it can write, None for uncompressed tar
+LIBARCHIVE_FILTERS = {
+    ArchiveFormat.TAR: None,
+    ArchiveFormat.GZTAR: 'gzip',
+    ArchiveFormat.BZTAR: 'bzip2',
+    ArchiveFormat.XZTAR: 'xz',
+    ArchiveFormat.ZSTD: 'zstd',
+}
+
+# libarchive filters that can compress on every core
+LIBARCHIVE_THREADED_FILTERS = {'xz', 'zstd'}
+
+# the formats that can be archived with libarchive, empty if libarchive-c is not installed
+LIBARCHIVE_FORMATS = frozenset(LIBARCHIVE_FILTERS) if libarchive is not None else frozenset()
+
+
+def make_tar_archive(
+        base_name: Union[str, Path],
+        base_dir: Union[str, Path],
+        archive_format: ArchiveFormat,
+        compression_level: int = None,
+        root_dir: Union[str, Path] = None,
+) -> str:
+    """
+    Create a tar archive, compressed at the given compression level for the compressed tar formats.
+
+    The tar stream is written straight through the compressor in tarfile's streaming mode,
+    so no intermediate uncompressed tar is created.
+
+    Args:
+        base_name (Union[str, Path]): The path to the archive file to be created, minus the extension.
+        base_dir (Union[str, Path]): The directory to archive, stored under this name in the archive.
+        archive_format (ArchiveFormat): The format of the archive (TAR, GZTAR, BZTAR, XZTAR, ZSTD, or BROTLI).
+        compression_level (int, optional): The compression level, ignored for TAR. Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+        root_dir (Union[str, Path], optional): The directory containing base_dir. Defaults to the current working directory.
+
+    Returns:
+        str: The path to the created archive file.
+    """
+
+    if compression_level is None:
+        compression_level = DEFAULT_COMPRESSION_LEVELS.get(archive_format)
+
+    archive_name = f'{base_name}.{archive_format.value}'
+
+    # the directory to add to the archive
+    source_directory = Path(root_dir, base_dir) if root_dir else Path(base_dir)
+
+    # check the format before creating the output file
+    if archive_format != ArchiveFormat.TAR and archive_format not in DEFAULT_COMPRESSION_LEVELS:
+        raise ValueError(f'{archive_format} is not a tar format')
+
+    if archive_format == ArchiveFormat.ZSTD and zstandard is None:
+        raise RuntimeError('zstd archives require the zstandard package or the zstd binary')
+
+    if archive_format == ArchiveFormat.BROTLI and brotli is None:
+        raise RuntimeError('brotli archives require the brotli package')
+
+    # buffer the output file so the compressor's small writes are coalesced into large write syscalls
+    with open(archive_name, 'wb', buffering=COPY_BUFSIZE) as output_file:
+
+        # wrap the output file in the compressor for the format
+        if archive_format == ArchiveFormat.TAR:
+            compressed_file = output_file
+
+        elif archive_format == ArchiveFormat.GZTAR:
+            compressed_file = gzip.GzipFile(fileobj=output_file, mode='wb', compresslevel=compression_level)
+
+        elif archive_format == ArchiveFormat.BZTAR:
+            compressed_file = bz2.BZ2File(output_file, 'wb', compresslevel=compression_level)
+
+        elif archive_format == ArchiveFormat.XZTAR:
+            compressed_file = lzma.LZMAFile(output_file, 'wb', preset=compression_level)
+
+        elif archive_format == ArchiveFormat.ZSTD:
+            # threads=-1 uses every core
+            compressor = zstandard.ZstdCompressor(level=compression_level, threads=-1)
+            compressed_file = compressor.stream_writer(output_file, closefd=False)
+
+        else:
+            compressed_file = _BrotliWriter(output_file, compression_level)
+
+        # stream the tar into the compressor, copying file contents in large blocks
+        with compressed_file:
+            with tarfile.open(fileobj=compressed_file, mode='w|', bufsize=TAR_BUFSIZE, copybufsize=COPY_BUFSIZE) as tar:
+                tar.add(source_directory, arcname=str(base_dir))
+
+    return archive_name
+
+
+def make_libarchive_archive(
+        base_name: Union[str, Path],
+        base_dir: Union[str, Path],
+        archive_format: ArchiveFormat,
+        compression_level: int = None,
+        root_dir: Union[str, Path] = None,
+) -> str:
+    """
+    Create a tar archive with libarchive, which walks, reads, and compresses the files in C rather than in tarfile.
+
+    Args:
+        base_name (Union[str, Path]): The path to the archive file to be created, minus the extension.
+        base_dir (Union[str, Path]): The directory to archive, stored under this name in the archive.
+        archive_format (ArchiveFormat): The format of the archive, one of LIBARCHIVE_FORMATS.
+        compression_level (int, optional): The compression level, ignored for TAR. Defaults to DEFAULT_COMPRESSION_LEVELS for the format.
+        root_dir (Union[str, Path], optional): The directory containing base_dir. Defaults to the current working directory.
+
+    Returns:
+        str: The path to the created archive file.
+
+    Raises:
+        ValueError: If libarchive-c is not installed or cannot write the format.
+    """
+
+    if archive_format not in LIBARCHIVE_FORMATS:
+        raise ValueError(f'{archive_format} archives cannot be created with libarchive')
+
+    archive_name = f'{base_name}.{archive_format.value}'
+
+    # the directory to add to the archive
+    source_directory = Path(root_dir, base_dir) if root_dir else Path(base_dir)
+
+    filter_name = LIBARCHIVE_FILTERS[archive_format]
+
+    # build the filter options, e.g. compression-level=3,threads=0
+    options = []
+
+    if filter_name is not None:
+        if compression_level is None:
+            compression_level = DEFAULT_COMPRESSION_LEVELS[archive_format]
+
+        options.append(f'compression-level={compression_level}')
+
+        # threads=0 uses every core
+        if filter_name in LIBARCHIVE_THREADED_FILTERS:
+            options.append('threads=0')
+
+    with libarchive.file_writer(archive_name, 'gnutar', filter_name, options=','.join(options)) as archive:
+        archive.add_files(str(source_directory), pathname=str(base_dir))
+
+    return archive_name
+
+
+def _make_zstd_archive(
+        base_name: str,
+        base_dir: str,
+        compression_level: int = DEFAULT_COMPRESSION_LEVELS[ArchiveFormat.ZSTD],
+        logger: logging.Logger = None,
+        dry_run: bool = False,
+        **kwargs,
+) -> str:
+    """
+    Create a zstd compressed tar archive, for use with shutil.make_archive.
+
+    Uses the zstandard package when it is installed, otherwise pipes tar into the zstd binary.
+
+    Args:
+        base_name (str): The path to the archive file to be created, minus the extension.
+        base_dir (str): The directory to archive, relative to the current working directory.
+        compression_level (int, optional): The zstd compression level. Defaults to 3.
+        logger (logging.Logger, optional): Logger passed through by shutil.make_archive. Defaults to None.
+        dry_run (bool, optional): If True, return the archive name without creating it. Defaults to False.
+
+    Returns:
+        str: The path to the created archive file.
+    """
+
+    archive_name = f'{base_name}.{ArchiveFormat.ZSTD.value}'
+
+    if logger is not None:
+        logger.info(f'Creating zstd archive: {archive_name}')
+
+    if dry_run:
+        return archive_name
+
+    if zstandard is not None:
+        make_tar_archive(base_name, base_dir, ArchiveFormat.ZSTD, compression_level)
+
+    elif shutil.which('zstd'):
+        # stream tar into zstd using every core
+        tar_process = subprocess.Popen(['tar', '-c', base_dir], stdout=subprocess.PIPE)
+        zstd_process = subprocess.Popen(
+            ['zstd', '-T0', f'-{compression_level}', '-q', '-f', '-o', archive_name],
+            stdin=tar_process.stdout
+        )
+        tar_process.stdout.close()
+
+        if zstd_process.wait() != 0 or tar_process.wait() != 0:
+            raise RuntimeError(f'Failed to create zstd archive: {archive_name}')
+
+    else:
+        raise RuntimeError('zstd archives require the zstandard package or the zstd binary')
+
+    return archive_name
+
+
+def _extract_tar_stream(tar: tarfile.TarFile, extract_dir: str, filter=None) -> None:
+    """
+    Extract every member of an open tar archive, refusing members that would be written outside the extract directory.
+
+    Args:
+        tar (tarfile.TarFile): The open tar archive.
+        extract_dir (str): The directory to extract the archive into.
+        filter (optional): The extraction filter passed through by shutil.unpack_archive. Defaults to None, meaning tarfile's data filter.
+
+    Returns:
+        None
+    """
+
+    # extraction filters are only available from python 3.12 (and security backports to earlier versions)
+    if hasattr(tarfile, 'data_filter'):
+        tar.extractall(extract_dir, filter=filter if filter is not None else 'data')
+
+    else:
+        tar.extractall(extract_dir)
+
+
+def _unpack_zstd_archive(filename: str, extract_dir: str, filter=None, **kwargs) -> None:
+    """
+    Unpack a zstd compressed tar archive, for use with shutil.unpack_archive.
 
-class ArchiveSuffixes(Enum):
+    Args:
+        filename (str): The path to the archive file.
+        extract_dir (str): The directory to extract the archive into.
+        filter (optional): The extraction filter passed through by shutil.unpack_archive. Defaults to None, meaning tarfile's data filter.
+
+    Returns:
+        None
+    """
+
+    if zstandard is not None:
+        with open(filename, 'rb', buffering=COPY_BUFSIZE) as archive_file:
+            with zstandard.ZstdDecompressor().stream_reader(archive_file, read_size=COPY_BUFSIZE) as reader:
+                with tarfile.open(fileobj=reader, mode='r|', bufsize=TAR_BUFSIZE, copybufsize=COPY_BUFSIZE) as tar:
+                    _extract_tar_stream(tar, extract_dir, filter)
+
+    elif shutil.which('zstd'):
+        subprocess.run(['tar', '--use-compress-program=zstd', '-xf', str(filename), '-C', str(extract_dir)], check=True)
+
+    else:
+        raise RuntimeError('zstd archives require the zstandard package or the zstd binary')
+
+
+def _register_unpack_format(name: str, extension: str, function, description: str) -> None:
+    """
+    Register an unpack format with shutil, unless shutil already unpacks its extension (e.g. .tar.zst from python 3.14).
+
+    Args:
+        name (str): The name of the format.
+        extension (str): The archive extension, including the leading dot.
+        function: The function unpacking the format, taking (filename, extract_dir).
+        description (str): The description of the format.
+
+    Returns:
+        None
+    """
+
+    if any(extension in extensions for _, extensions, _ in shutil.get_unpack_formats()):
+        return
+
+    shutil.register_unpack_format(name, [extension], function, [], description)
+
+
+# register zstd with shutil so make_archive/unpack_archive can use it like the built in formats
+shutil.register_archive_format('zstd', _make_zstd_archive, [], 'zstd compressed tar file')
+_register_unpack_format('zstd', f'.{ArchiveFormat.ZSTD.value}', _unpack_zstd_archive, 'zstd compressed tar file')
+
+
+class _BrotliWriter:
+    """
+    Write only file object that brotli compresses everything written to it into another file object.
+
+    The brotli package only offers a one shot Compressor, so this gives tarfile's streaming mode something to write to.
+    """
+
+    def __init__(self, fileobj, quality: int = DEFAULT_COMPRESSION_LEVELS[ArchiveFormat.BROTLI]):
+        self._fileobj = fileobj
+
+        # text mode tunes the compressor for the source code, logs, and json these archives usually hold
+        self._compressor = brotli.Compressor(quality=quality, mode=brotli.MODE_TEXT)
+
+    def write(self, data) -> int:
+        self._fileobj.write(self._compressor.process(data))
+        return len(data)
+
+    def close(self) -> None:
+        # write out the end of the brotli stream, once
+        if self._compressor is not None:
+            self._fileobj.write(self._compressor.finish())
+            self._compressor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _BrotliReader:
+    """
+    Read only file object that decompresses a brotli compressed file object, for tarfile's streaming mode.
+
+    Only about as much output as each read asks for is decompressed, so a small archive of highly compressible
+    data can't expand into memory all at once.
+    """
+
+    # input fed per process call by brotli versions without output_buffer_limit, whose output can't be capped
+    _UNBOUNDED_READ_SIZE = 64 * 1024
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._decompressor = brotli.Decompressor()
+        self._buffer = bytearray()
+
+        # brotli 1.1+ can cap the output of each process call
+        self._bounded = hasattr(self._decompressor, 'can_accept_more_data')
+
+    def read(self, size: int = -1) -> bytes:
+        # decompress until there is enough data to return, or the stream ends
+        while (size < 0 or len(self._buffer) < size) and not self._decompressor.is_finished():
+
+            if not self._bounded:
+                chunk = self._fileobj.read(self._UNBOUNDED_READ_SIZE)
+
+                if not chunk:
+                    break
 
-    SUFFIXES = {'.zip', '.tar', '.gz', '.bz2', '.xz'}
+                self._buffer += self._decompressor.process(chunk)
+                continue
+
+            # once the output limit is hit, the decompressor must be drained with empty input before it takes more
+            chunk = self._fileobj.read(COPY_BUFSIZE) if self._decompressor.can_accept_more_data() else b''
+
+            output_limit = size - len(self._buffer) if size >= 0 else COPY_BUFSIZE
+            output = self._decompressor.process(chunk, output_buffer_limit=output_limit)
+
+            # the input has ended, and so has the input the decompressor was still holding
+            if not chunk and not output:
+                break
+
+            self._buffer += output
+
+        if size < 0:
+            size = len(self._buffer)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+
+        return data
+
+
+def _make_brotli_archive(
+        base_name: str,
+        base_dir: str,
+        compression_level: int = DEFAULT_COMPRESSION_LEVELS[ArchiveFormat.BROTLI],
+        logger: logging.Logger = None,
+        dry_run: bool = False,
+        **kwargs,
+) -> str:
+    """
+    Create a brotli compressed tar archive, for use with shutil.make_archive.
+
+    Args:
+        base_name (str): The path to the archive file to be created, minus the extension.
+        base_dir (str): The directory to archive, relative to the current working directory.
+        compression_level (int, optional): The brotli quality. Defaults to 4, as 11 is far slower than gzip.
+        logger (logging.Logger, optional): Logger passed through by shutil.make_archive. Defaults to None.
+        dry_run (bool, optional): If True, return the archive name without creating it. Defaults to False.
+
+    Returns:
+        str: The path to the created archive file.
+    """
+
+    archive_name = f'{base_name}.{ArchiveFormat.BROTLI.value}'
+
+    if logger is not None:
+        logger.info(f'Creating brotli archive: {archive_name}')
+
+    if dry_run:
+        return archive_name
+
+    return make_tar_archive(base_name, base_dir, ArchiveFormat.BROTLI, compression_level)
+
+
+def _unpack_brotli_archive(filename: str, extract_dir: str, filter=None, **kwargs) -> None:
+    """
+    Unpack a brotli compressed tar archive, for use with shutil.unpack_archive.
+
+    Args:
+        filename (str): The path to the archive file.
+        extract_dir (str): The directory to extract the archive into.
+        filter (optional): The extraction filter passed through by shutil.unpack_archive. Defaults to None, meaning tarfile's data filter.
+
+    Returns:
+        None
+    """
+
+    if brotli is None:
+        raise RuntimeError('brotli archives require the brotli package')
+
+    with open(filename, 'rb', buffering=COPY_BUFSIZE) as archive_file:
+        with tarfile.open(fileobj=_BrotliReader(archive_file), mode='r|', bufsize=TAR_BUFSIZE, copybufsize=COPY_BUFSIZE) as tar:
+            _extract_tar_stream(tar, extract_dir, filter)
+
+
+# register brotli with shutil the same way as zstd
+shutil.register_archive_format('brotli', _make_brotli_archive, [], 'brotli compressed tar file')
+_register_unpack_format('brotli', f'.{ArchiveFormat.BROTLI.value}', _unpack_brotli_archive, 'brotli compressed tar file')
 
 
 class ByteSize(int):
@@ -64,21 +561,38 @@ class ByteSize(int):
     def __new__(cls, *args, **kwargs):
         return super().__new__(cls, *args, **kwargs)
 
-    def __init__(self, *args, **kwargs):
-        self.bytes = self.B = int(self)
-        self.kilobytes = self.KB = self / self._KB ** 1
-        self.megabytes = self.MB = self / self._KB ** 2
-        self.gigabytes = self.GB = self / self._KB ** 3
-        self.petabytes = self.PB = self / self._KB ** 4
-        *suffixes, last = self._suffixes
-        suffix = next((
-            suffix
-            for suffix in suffixes
-            if 1 < getattr(self, suffix) < self._KB
-        ), last)
-        self.readable = suffix, getattr(self, suffix)
-
-        super().__init__()
+    # the unit conversions are only computed the first time they are accessed
+    @cached_property
+    def bytes(self):
+        return int(self)
+
+    @cached_property
+    def kilobytes(self):
+        return self / self._KB ** 1
+
+    @cached_property
+    def megabytes(self):
+        return self / self._KB ** 2
+
+    @cached_property
+    def gigabytes(self):
+        return self / self._KB ** 3
+
+    @cached_property
+    def petabytes(self):
+        return self / self._KB ** 4
+
+    B = property(lambda self: self.bytes)
+    KB = property(lambda self: self.kilobytes)
+    MB = property(lambda self: self.megabytes)
+    GB = property(lambda self: self.gigabytes)
+    PB = property(lambda self: self.petabytes)
+
+    @cached_property
+    def readable(self):
+        # each unit is 2 ** 10 times the last, so the largest unit below the size follows from its bit length
+        index = min(len(self._suffixes) - 1, max(0, (int(self).bit_length() - 1) // 10))
+        return self._suffixes[index], self / self._KB ** index
 
     def __str__(self):
         return self.__format__('.2f')
@@ -109,6 +623,279 @@ class ByteSize(int):
         return self.__class__(super().__rmul__(other))
 
 
+def _walk_files(folder_path: Union[str, Path]) -> Iterator[os.DirEntry]:
+    """
+    Yield every entry under a directory that isn't itself a directory, with a stack based os.scandir walk.
+
+    DirEntry caches the file type from readdir, so the tree is walked without a stat per entry.
+
+    Args:
+        folder_path (Union[str, Path]): Path to the directory.
+
+    Returns:
+        Iterator[os.DirEntry]: The files, symlinks, and special files under the directory.
+
+    Raises:
+        OSError: If the directory itself can't be read, e.g. it doesn't exist. Unreadable subdirectories are skipped.
+    """
+
+    stack = [folder_path]
+
+    while stack:
+        directory = stack.pop()
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+
+        # skip subdirectories we can't read, but a missing root must not look like an empty tree
+        except OSError:
+            if directory is folder_path:
+                raise
+
+
+def _get_tree_size(folder_path: Union[str, Path]) -> int:
+    """
+    Sum the size of every regular file under a directory, leaving one stat per regular file for its size.
+
+    Args:
+        folder_path (Union[str, Path]): Path to the directory.
+
+    Returns:
+        int: Total size of all files in bytes.
+    """
+
+    total_size = 0
+
+    try:
+        for entry in _walk_files(folder_path):
+            if entry.is_file(follow_symlinks=False):
+                try:
+                    total_size += entry.stat(follow_symlinks=False).st_size
+
+                # the file was removed during the walk
+                except OSError:
+                    pass
+
+    # skip subdirectories we can't read, like the rest of the walk does
+    except OSError:
+        pass
+
+    return total_size
+
+
+def _get_tree_size_parallel(folder_path: Union[str, Path]) -> int:
+    """
+    Sum the size of every file under a directory, walking each top level subdirectory in a thread pool.
+
+    os.scandir and stat release the GIL, so the walks overlap their syscalls.
+
+    Args:
+        folder_path (Union[str, Path]): Path to the directory.
+
+    Returns:
+        int: Total size of all files in bytes.
+    """
+
+    total_size = 0
+    subdirectories = []
+
+    # sum the top level files here and collect the subdirectories to hand out to the workers
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                total_size += entry.stat(follow_symlinks=False).st_size
+
+    if not subdirectories:
+        return total_size
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirectories))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_get_tree_size, subdirectory) for subdirectory in subdirectories]
+        total_size += sum(future.result() for future in as_completed(futures))
+
+    return total_size
+
+
+def _get_tree_size_io_uring(folder_path: Union[str, Path]) -> int:
+    """
+    Sum the size of every file under a directory, batching the stat calls through io_uring.
+
+    The tree is enumerated with os.scandir, then the files are stat'ed IO_URING_BATCH_SIZE at a time
+    with IORING_OP_STATX, so each batch costs one syscall instead of one per file.
+
+    Args:
+        folder_path (Union[str, Path]): Path to the directory.
+
+    Returns:
+        int: Total size of all files in bytes.
+
+    Raises:
+        OSError: If the io_uring ring can't be set up (e.g. io_uring is disabled in this kernel).
+        AttributeError, TypeError: If the installed liburing has a different api.
+    """
+
+    # enumerate the files, scandir gives us the file type without a stat
+    file_paths = [entry.path for entry in _walk_files(folder_path) if entry.is_file(follow_symlinks=False)]
+
+    total_size = 0
+
+    ring = liburing.Ring()
+    liburing.io_uring_queue_init(IO_URING_BATCH_SIZE, ring)
+
+    try:
+        cqe = liburing.Cqe()
+
+        for start in range(0, len(file_paths), IO_URING_BATCH_SIZE):
+            batch = file_paths[start:start + IO_URING_BATCH_SIZE]
+
+            # queue a statx for every file in the batch, then submit them with a single syscall
+            statxs = [liburing.Statx() for _ in batch]
+
+            for file_path, statx in zip(batch, statxs):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(sqe, statx, file_path, liburing.AT_SYMLINK_NOFOLLOW, liburing.STATX_SIZE)
+
+            liburing.io_uring_submit_and_wait(ring, len(batch))
+
+            # drain the completions, a failed statx leaves its size at zero
+            completed = 0
+            while completed < len(batch):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                ready = liburing.io_uring_cq_ready(ring)
+
+                for index in range(ready):
+                    try:
+                        cqe[index]
+                    except OSError:
+                        pass
+
+                liburing.io_uring_cq_advance(ring, ready)
+                completed += ready
+
+            total_size += sum(statx.size for statx in statxs)
+
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+    return total_size
+
+
+def _get_file_stats(entries: Iterable[os.DirEntry], folder_path: str) -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    Stat the given files for get_folder_fingerprint_and_size.
+
+    Args:
+        entries (Iterable[os.DirEntry]): The files, symlinks, and special files to stat.
+        folder_path (str): The directory being fingerprinted, which the paths are made relative to.
+
+    Returns:
+        Tuple[List[Tuple[str, int, int]], int]: The (relative path, size, modification time in ns) of every entry,
+            and the total size of the regular files among them.
+    """
+
+    file_stats = []
+    total_size = 0
+
+    for entry in entries:
+        try:
+            stat_result = entry.stat(follow_symlinks=False)
+
+        # the file was removed during the walk
+        except OSError:
+            continue
+
+        file_stats.append((os.path.relpath(entry.path, folder_path), stat_result.st_size, stat_result.st_mtime_ns))
+
+        if stat.S_ISREG(stat_result.st_mode):
+            total_size += stat_result.st_size
+
+    return file_stats, total_size
+
+
+def _get_subdirectory_file_stats(subdirectory: str, folder_path: str) -> Tuple[List[Tuple[str, int, int]], int]:
+    """
+    Walk and stat every file under one subdirectory of the directory being fingerprinted.
+
+    Args:
+        subdirectory (str): Path to the subdirectory.
+        folder_path (str): The directory being fingerprinted, which the paths are made relative to.
+
+    Returns:
+        Tuple[List[Tuple[str, int, int]], int]: The same as _get_file_stats, empty if the subdirectory can't be read.
+    """
+
+    try:
+        return _get_file_stats(_walk_files(subdirectory), folder_path)
+
+    # skip subdirectories we can't read, like the rest of the walk does
+    except OSError:
+        return [], 0
+
+
+def get_folder_fingerprint_and_size(folder_path: Union[str, Path]) -> Tuple[str, ByteSize]:
+    """
+    Get a fingerprint of a directory's contents from the relative path, size, and modification time of every file,
+    along with the total size of its regular files, from the same walk.
+
+    This only needs a stat walk, so it is much cheaper than hashing file contents, and changes whenever
+    a file is added, removed, resized, or modified. Each top level subdirectory is walked in a thread pool,
+    as os.scandir and stat release the GIL.
+
+    Args:
+        folder_path (Union[str, Path]): Path to the directory.
+
+    Returns:
+        Tuple[str, ByteSize]: Hex digest of the directory's contents, and the total size of its regular files in bytes,
+            the same as get_folder_size.
+
+    Raises:
+        OSError: If the directory can't be read, e.g. it doesn't exist.
+    """
+
+    folder_path = str(folder_path)
+
+    # list the top level here, raising if the directory itself can't be read
+    with os.scandir(folder_path) as entries:
+        top_level_entries = list(entries)
+
+    subdirectories = [entry.path for entry in top_level_entries if entry.is_dir(follow_symlinks=False)]
+
+    file_stats, total_size = _get_file_stats(
+        (entry for entry in top_level_entries if not entry.is_dir(follow_symlinks=False)), folder_path
+    )
+
+    # hand the subdirectories out to the workers
+    if subdirectories:
+
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirectories))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_get_subdirectory_file_stats, subdirectory, folder_path) for subdirectory in subdirectories]
+
+            for future in as_completed(futures):
+                subdirectory_file_stats, subdirectory_size = future.result()
+                file_stats.extend(subdirectory_file_stats)
+                total_size += subdirectory_size
+
+    # sort so the fingerprint doesn't depend on directory listing order
+    file_stats.sort()
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    for relative_path, size, mtime_ns in file_stats:
+        digest.update(f'{relative_path}\0{size}\0{mtime_ns}\n'.encode('utf-8', 'surrogateescape'))
+
+    return digest.hexdigest(), ByteSize(total_size)
+
+
 def get_folder_size(folder_path: Union[str, Path]) -> ByteSize:
     """
     Get the total size of all files in a directory.
@@ -118,17 +905,38 @@ def get_folder_size(folder_path: Union[str, Path]) -> ByteSize:
 
     Returns:
         ByteSize: Total size of all files in bytes.
+
+    Raises:
+        ValueError: If the path does not exist or is not a directory.
     """
 
     folder = Path(folder_path)
 
+    # stat the path once, and classify the result, instead of prechecking with is_dir
+    try:
+        folder_stat = os.stat(folder)
+    except (FileNotFoundError, NotADirectoryError):
+        raise ValueError(f"{folder_path} does not exist.")
+
     # Check if the path is a directory
-    if not folder.is_dir():
+    if not stat.S_ISDIR(folder_stat.st_mode):
         raise ValueError(f"{folder_path} is not a directory.")
 
     # Get the total size of all files in the directory
     try:
-        total_size = ByteSize(sum(f.stat().st_size for f in folder.glob('**/*') if f.is_file()))
+        total_size = None
+
+        # use io_uring to batch the stat calls if it is available
+        if liburing is not None:
+            try:
+                total_size = ByteSize(_get_tree_size_io_uring(folder))
+
+            # e.g. io_uring disabled in this kernel, or a liburing build with a different api
+            except Exception as e:
+                logging.debug(f"io_uring unavailable, falling back to os.scandir: {str(e)}")
+
+        if total_size is None:
+            total_size = ByteSize(_get_tree_size_parallel(folder))
     except Exception as e:
         logging.error(f"Non-critical error: {str(e)}")
         total_size = None
@@ -145,20 +953,23 @@ def get_file_size(file_path: Union[str, Path]) -> ByteSize:
 
     Returns:
         ByteSize: Size of the file in bytes.
+
+    Raises:
+        ValueError: If the path does not exist or is not a regular file.
     """
 
-    file = Path(file_path)
+    # a single stat gives both the file type and the size
+    try:
+        file_stat = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise ValueError(f"{file_path} does not exist.")
 
     # Check if the path is a file
-    if not file.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         raise ValueError(f"{file_path} is not a File.")
 
     # Get the size of the file
-    try:
-        file_size = ByteSize(file.stat().st_size)
-    except Exception as e:
-        logging.error(f"Non-critical error: {str(e)}")
-        file_size = None
+    file_size = ByteSize(file_stat.st_size)
 
     return file_size
 
@@ -173,13 +984,11 @@ def get_time_hh_mm_ss(sec: Union[int, float]) -> str:
         str: A string representing the time in the format 'H Hours, M Minutes, S Seconds'.
     """
 
-    # create timedelta and convert it into string
-    td_str = str(timedelta(seconds=sec))
+    # split the seconds into hours, minutes and seconds, hours keep counting past a day
+    hours, remainder = divmod(int(sec), 3600)
+    minutes, seconds = divmod(remainder, 60)
 
-    # split string into individual component
-    time_split_string = td_str.split(':')
-
-    time_string = f'{time_split_string[0]} Hours, {time_split_string[1]} Minutes, {time_split_string[2]} Seconds'
+    time_string = f'{hours} Hours, {minutes} Minutes, {seconds} Seconds'
 
     return time_string
 
@@ -188,6 +997,9 @@ def setup_logger(output_directory: Union[str, Path], log_level: int = logging.WA
     """
     Set up the logger for the script.
 
+    Only the first call in a process configures logging, later calls return the same logger
+    without opening another log file, until stop_logger is called.
+
     Args:
         output_directory (Union[str, Path]): The directory to output log files.
         log_level (int): The logging severity level to set. Should be one defined in the logging module
@@ -198,64 +1010,141 @@ def setup_logger(output_directory: Union[str, Path], log_level: int = logging.WA
         logging.Logger: The logger object.
     """
 
-    # Set up logger
-    current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    global _log_queue, _log_listener, _queue_handler, _configured
 
-    if log_type:
-        # set up where to output log files to
-        log_file_name = f"{log_type}_log_{current_datetime}.txt"
-    else:
-        # set up where to output log files to
-        log_file_name = f"log_{current_datetime}.txt"
+    with _logger_lock:
 
-    # define directory to output log files, and create if it doesn't exist
-    log_files_dir = Path(output_directory, 'logs')
+        # logging is already set up in this process
+        if _configured:
+            return logging.getLogger(__name__)
 
-    # check if log dir exists, if not, make it
-    if not log_files_dir.is_dir():
-        log_files_dir.mkdir(parents=True, exist_ok=True)
+        # Set up logger
+        current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
-    log_filepath = Path(log_files_dir, log_file_name)
+        if log_type:
+            # set up where to output log files to
+            log_file_name = f"{log_type}_log_{current_datetime}.txt"
+        else:
+            # set up where to output log files to
+            log_file_name = f"log_{current_datetime}.txt"
 
-    # Create a logger object
-    logger = logging.getLogger(__name__)
+        # define directory to output log files, and create it along with any parents if it doesn't exist
+        log_files_dir = Path(output_directory, 'logs')
+        os.makedirs(log_files_dir, exist_ok=True)
 
-    # set up logger
-    logging.basicConfig(
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            # Add a FileHandler to log to a file in the output directory
-            logging.FileHandler(log_filepath)
-        ],
-    )
+        log_filepath = Path(log_files_dir, log_file_name)
+
+        # Create a logger object
+        logger = logging.getLogger(__name__)
+
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        # Add a RotatingFileHandler to log to a file in the output directory, so long batches don't grow it unbounded
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_filepath, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT
+        )
+        file_handler.setFormatter(formatter)
+
+        # the real handlers run on a background listener thread, so logging calls only pay for a queue put.
+        # a multiprocessing queue lets worker processes log through the same listener
+        _log_queue = multiprocessing.Queue(-1)
+
+        _log_listener = logging.handlers.QueueListener(_log_queue, stream_handler, file_handler)
+        _log_listener.start()
+
+        # flush any queued records on exit, if the script doesn't stop the listener itself
+        atexit.register(stop_logger)
 
-    # set log level seperately from the logger instantiation, so it works properly
-    logging.getLogger().setLevel(log_level)
+        _queue_handler = logging.handlers.QueueHandler(_log_queue)
+        logging.getLogger().addHandler(_queue_handler)
 
-    # # print log file location
-    logging.info(f'Log file output to: {log_filepath}')
+        # set log level seperately from the logger instantiation, so it works properly
+        logging.getLogger().setLevel(log_level)
 
-    return logger
+        # # print log file location
+        logging.info(f'Log file output to: {log_filepath}')
 
-def remove_suffixes(path: Path, suffixes_to_remove: List[str]) -> Path:
+        _configured = True
+
+        return logger
+
+
+def stop_logger() -> None:
     """
-    Removes specified suffixes from a pathlib.Path object
+    Stop the log listener started by setup_logger, once every queued record has been handled,
+    then close its handlers (and with them the log file) and the log queue.
 
-    Args:
-    - path (Path): The pathlib.Path object
-    - suffixes_to_remove (list): List of suffixes to be removed
+    Safe to call more than once. Records logged afterwards are no longer sent to the queue,
+    and the next setup_logger call configures logging again.
 
     Returns:
-    - Path: the modified pathlib.Path object
+        None
+    """
+
+    global _log_queue, _log_listener, _queue_handler, _configured
+
+    with _logger_lock:
+
+        if _queue_handler is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _queue_handler = None
+
+        if _log_listener is not None:
+            _log_listener.stop()
+
+            # close the stream and file handlers, releasing the log file's descriptor
+            for handler in _log_listener.handlers:
+                handler.close()
 
+            _log_listener = None
+
+        if _log_queue is not None:
+            # wait for the queue's feeder thread to flush and exit
+            _log_queue.close()
+            _log_queue.join_thread()
+            _log_queue = None
+
+        _configured = False
+
+
+def get_log_queue() -> Union[multiprocessing.Queue, None]:
+    """
+    Get the queue that log records are sent through, for passing to worker processes.
+
+    Returns:
+        Union[multiprocessing.Queue, None]: The log queue, or None if setup_logger has not been called.
+    """
+
+    return _log_queue
+
+
+def setup_worker_logger(log_queue: Union[multiprocessing.Queue, None], log_level: int = logging.WARNING) -> None:
+    """
+    Set up logging in a worker process so records are sent to the parent's listener.
+
+    Meant to be passed as the initializer of a process pool, along with the queue from get_log_queue().
+
+    Args:
+        log_queue (Union[multiprocessing.Queue, None]): The queue returned by get_log_queue() in the parent process.
+        log_level (int): The logging severity level to set.
+
+    Returns:
+        None
     """
 
-    # remove extension suffixes
-    for suffix in suffixes_to_remove:
-        path = path.with_suffix(path.suffix.removesuffix(suffix))
+    root_logger = logging.getLogger()
+
+    # drop any handlers inherited from the parent when the process was forked
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
 
-    return path
+    if log_queue is not None:
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    root_logger.setLevel(log_level)
 
 
 def get_base_directory(source_file: Union[str, Path]) -> Path:
@@ -271,14 +1160,7 @@ def get_base_directory(source_file: Union[str, Path]) -> Path:
     # the path the source archive file
     source_file = Path(source_file)
 
-    # get the archive directory suffixes
-    unpacked_archive_directory_suffixes = source_file.suffixes
-    # reverse their order to they are removed from right to left
-    unpacked_archive_directory_suffixes.reverse()
-    # Preserve the order of suffixes when getting the intersection
-    archive_suffixes_to_remove = [suffix for suffix in unpacked_archive_directory_suffixes if suffix in ArchiveSuffixes.SUFFIXES.value]
-
-    # Remove suffixes from archive directory name
-    path = remove_suffixes(source_file, archive_suffixes_to_remove)
+    # Remove the archive suffixes from the end of the name in a single match, rather than one suffix at a time
+    path = source_file.with_name(_ARCHIVE_TAIL.sub('', source_file.name))
 
     return path
\ No newline at end of file